@@ -1,19 +1,29 @@
-from sqlalchemy import select
-from app.core.security import BearerToken
-from app.database.models import User
 from app.core.config import get_settings
-from app.repositories.user_repository import user_repo
+from app.core.rate_limit import rate_limiter
+from app.core.security import BearerToken
+from app.database.routing import set_consistency_key
+from app.core.tokens import TokenError, token_manager
+from app.schemas.user_schema import CurrentUser
+from app.services import auth_service
 
 from typing import Annotated
 
 from fastapi import Depends, HTTPException, Query, Request, status
-from jose import JWTError, jwt
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.schemas.pagination_schema import PaginationParams
+from app.repositories.base_repository import BaseRepository
+from app.schemas.filter_schema import ExportParams, FilterParams
+from app.schemas.pagination_schema import CursorPaginationParams, PaginationParams
 
 async def async_get_db(request: Request):
-    async with AsyncSession(request.app.state.db_pool) as db:
+    """
+    Yields the request scoped database session.
+
+    FastAPI caches dependencies per request, so `get_current_user` and the
+    endpoint share this one session.
+    """
+    async with request.app.state.db_session_factory() as db:
         yield db
 
 
@@ -24,23 +34,95 @@ async def get_current_user(token: BearerToken, db: Annotated[AsyncSession, Depen
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token.credentials, get_settings().jwt_secret_key)
-        user_id = payload.get("sub")
-        if user_id is None:
+        payload = token_manager.decode(token.credentials)
+        if payload.get("sub") is None:
             raise credentials_exception
-    except JWTError:
+    except TokenError:
         raise credentials_exception
-    user = await user_repo.get_by_attribute(db, attribute="id", value=int(user_id))
+    # Keeps this user's reads on the primary shortly after their writes
+    set_consistency_key(str(payload["sub"]))
+    user = await auth_service.get_current_user(db, claims=payload)
     if user is None:
         raise credentials_exception
     return user
 
 
 
+def auth_rate_limit(scope: str, body: type[BaseModel]):
+    """
+    Dependency factory which takes a token from the client IP and the email
+    buckets of `scope`, raising `TooManyRequestsException` once either is
+    empty. It runs before the endpoint, so rejected attempts never reach the
+    database or bcrypt
+
+    Args:
+        scope (str): name of the guarded action, each has its own buckets
+        body (type[BaseModel]): request body schema of the endpoint, with an `email` field
+    """
+
+    async def check_rate_limit(request: Request, data: body) -> None:
+        settings = get_settings()
+        client_ip = request.client.host if request.client else "unknown"
+        await rate_limiter.hit(
+            f"{scope}:ip:{client_ip}",
+            capacity=settings.auth_rate_limit_ip_capacity,
+            per_minute=settings.auth_rate_limit_ip_per_minute,
+        )
+        await rate_limiter.hit(
+            f"{scope}:email:{data.email.lower()}",
+            capacity=settings.auth_rate_limit_email_capacity,
+            per_minute=settings.auth_rate_limit_email_per_minute,
+        )
+
+    return check_rate_limit
+
+
 # Usable Dependencies
 
 AsyncSessionDep = Annotated[AsyncSession, Depends(async_get_db)]
 
 PaginationParamsDep = Annotated[PaginationParams, Query()]
 
-CurrentUserDep = Annotated[User, Depends(get_current_user)]
\ No newline at end of file
+CursorPaginationParamsDep = Annotated[CursorPaginationParams, Query()]
+
+FilterParamsDep = Annotated[FilterParams, Query()]
+
+ExportParamsDep = Annotated[ExportParams, Query()]
+
+CurrentUserDep = Annotated[CurrentUser, Depends(get_current_user)]
+
+
+def paginated_list(repository: BaseRepository, schema: type[BaseModel] | None = None):
+    """
+    Dependency factory which loads one cursor paginated page of `repository`
+    records, shaped as a `CursorPaginatedResponse`
+
+    Args:
+        repository (BaseRepository): repository to list records from
+        schema (type[BaseModel], optional): response schema of a record. When
+            given only its columns are selected and records are plain dicts,
+            ready for `RawJSONResponse`
+    """
+    fields = repository.schema_fields(schema) if schema else None
+
+    async def get_paginated_list(db: AsyncSessionDep, params: CursorPaginationParamsDep) -> dict:
+        records, next_cursor = await repository.get_page(
+            db,
+            cursor=params.cursor,
+            limit=params.per_page,
+            order_by=params.order_by,
+            descending=params.descending,
+            fields=fields,
+        )
+        page = {
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None,
+            "data": records,
+        }
+        if params.count is not None:
+            total, exact = await repository.count_total(db, strategy=params.count)
+            page.update(total=total, total_exact=exact)
+        return page
+
+    return get_paginated_list
+
@@ -1,6 +1,8 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints.user_api import auth_router
+from app.api.v1.endpoints.user_api import auth_router, user_router
+from app.api.v1.endpoints.internal_api import internal_router
+from app.api.v1.endpoints.job_api import job_router
 
 
 v1_router = APIRouter(
@@ -8,4 +10,7 @@ v1_router = APIRouter(
 )
 
 
-v1_router.include_router(auth_router)
\ No newline at end of file
+v1_router.include_router(auth_router)
+v1_router.include_router(user_router)
+v1_router.include_router(internal_router)
+v1_router.include_router(job_router)
\ No newline at end of file
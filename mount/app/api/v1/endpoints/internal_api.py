@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Request
+
+from app.api.dependencies import CurrentUserDep
+from app.core.hashing import password_hasher
+from app.core.rate_limit import rate_limiter
+from app.core.response_cache import response_cache
+from app.core.responses import SchemaResponse
+from app.database.core import get_pool_stats
+from app.repositories.base_repository import identity_cache_stats
+from app.schemas.base_schema import BaseResponseModel
+from app.schemas.internal_schema import RuntimeStats
+
+
+internal_router = APIRouter(tags=["Internal"])
+
+
+@internal_router.get(
+    "/internal/stats",
+    response_model=BaseResponseModel[RuntimeStats],
+)
+async def get_runtime_stats(request: Request, current_user: CurrentUserDep):
+    """
+    Live runtime statistics of this worker process.
+
+    Reports the database connection pools (checked out connections, overflow,
+    checkout wait times), the password hashing pool, the auth rate
+    limiter, the response cache and the identity cache, to help sizing them under load.
+    """
+    return SchemaResponse(BaseResponseModel[RuntimeStats], {
+        "data": {
+            "db_pool": get_pool_stats(request.app.state.db_pool),
+            "db_replica_pools": [get_pool_stats(replica) for replica in request.app.state.db_replicas],
+            "password_hasher": password_hasher.stats(),
+            "rate_limiter": rate_limiter.stats(),
+            "response_cache": response_cache.stats(),
+            "identity_cache": identity_cache_stats(),
+        }
+    })
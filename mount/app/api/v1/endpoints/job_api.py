@@ -0,0 +1,91 @@
+from fastapi import APIRouter, status
+from fastapi.responses import FileResponse
+
+from app.api.dependencies import AsyncSessionDep, CurrentUserDep
+from app.core.exports import export_file
+from app.core.responses import SchemaResponse
+from app.database.models.job import JobStatus
+from app.exceptions.base_exception import HTTPExceptionResponseModel
+from app.exceptions.job_exception import JobNotFoundException, JobResultUnavailableException
+from app.jobs import enqueue
+from app.repositories.job_repository import job_repo
+from app.schemas.base_schema import BaseResponseModel
+from app.schemas.job_schema import JobEnqueueRequest, JobRead
+
+
+job_router = APIRouter(tags=["Jobs"])
+
+
+@job_router.post(
+    "/jobs/{name}",
+    response_model=BaseResponseModel[JobRead],
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={
+        status.HTTP_404_NOT_FOUND: {"model": HTTPExceptionResponseModel},
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {"model": HTTPExceptionResponseModel},
+    },
+)
+async def enqueue_job(name: str, data: JobEnqueueRequest, db: AsyncSessionDep, current_user: CurrentUserDep):
+    """
+    Queue a background job and return straight away. Only jobs registered
+    as public can be queued here, e.g. `export_users` with the query
+    parameters of `/users/export` as payload.
+
+    Poll the URL in the `Location` header for its status and result.
+    """
+    job = await enqueue(
+        db,
+        name,
+        data.payload,
+        delay_seconds=data.delay_seconds,
+        created_by=current_user.id,
+        public_only=True,
+    )
+    return SchemaResponse(
+        BaseResponseModel[JobRead],
+        {"data": job},
+        status_code=status.HTTP_202_ACCEPTED,
+        headers={"Location": f"/api/v1/jobs/{job.id}"},
+    )
+
+
+@job_router.get(
+    "/jobs/{id}",
+    response_model=BaseResponseModel[JobRead],
+    responses={
+        status.HTTP_404_NOT_FOUND: {"model": HTTPExceptionResponseModel},
+    },
+)
+async def get_job(id: int, db: AsyncSessionDep, current_user: CurrentUserDep):
+    """
+    Status of a background job queued by the current user, with its result
+    once it succeeded.
+    """
+    job = await job_repo.get(db, id)
+    if job is None or job.created_by != current_user.id:
+        raise JobNotFoundException(id)
+    return SchemaResponse(BaseResponseModel[JobRead], {"data": job})
+
+
+@job_router.get(
+    "/jobs/{id}/file",
+    response_class=FileResponse,
+    responses={
+        status.HTTP_404_NOT_FOUND: {"model": HTTPExceptionResponseModel},
+        status.HTTP_409_CONFLICT: {"model": HTTPExceptionResponseModel},
+    },
+)
+async def download_job_file(id: int, db: AsyncSessionDep, current_user: CurrentUserDep):
+    """
+    Download the file written by a succeeded job of the current user, such
+    as `export_users`. Files are deleted after `export_file_ttl_seconds`.
+    """
+    job = await job_repo.get(db, id)
+    if job is None or job.created_by != current_user.id:
+        raise JobNotFoundException(id)
+
+    result = job.result or {}
+    path = export_file(result["file"]) if job.status == JobStatus.SUCCEEDED.value and "file" in result else None
+    if path is None:
+        raise JobResultUnavailableException(id)
+    return FileResponse(path, media_type=result.get("media_type"), filename=result.get("filename"))
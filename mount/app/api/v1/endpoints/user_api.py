@@ -1,21 +1,48 @@
-from typing import Annotated
-from fastapi import APIRouter, Depends, status
+from typing import Annotated, Any
+from fastapi import APIRouter, Depends, Request, Response, status
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 
-from app.schemas.user_schema import TokenRequest, TokenResponse, UserCreateRequest, UserRead
+from app.schemas.user_schema import (
+    RefreshTokenRequest,
+    RefreshTokenResponse,
+    TokenRequest,
+    TokenResponse,
+    UserCreateRequest,
+    UserPublic,
+    UserRead,
+)
 from app.services import auth_service
-from app.api.dependencies import AsyncSessionDep
+from app.core.exports import export_records
+from app.core.response_cache import CachedRoute, cache_response
+from app.core.responses import RawJSONResponse, SchemaResponse
+from app.api.dependencies import (
+    AsyncSessionDep,
+    CurrentUserDep,
+    ExportParamsDep,
+    FilterParamsDep,
+    auth_rate_limit,
+    paginated_list,
+)
 from app.exceptions.base_exception import HTTPExceptionResponseModel
+from app.repositories.user_repository import user_repo
 from app.schemas.base_schema import BaseResponseModel
+from app.schemas.pagination_schema import CursorPaginatedResponse
 
 
 auth_router = APIRouter(tags=["Auth"])
 
+user_router = APIRouter(tags=["Users"], route_class=CachedRoute)
+
 
 @auth_router.post(
     "/auth/register",
     response_model=BaseResponseModel[UserRead],
-    status_code=201
+    status_code=201,
+    dependencies=[Depends(auth_rate_limit("register", UserCreateRequest))],
+    responses={
+        status.HTTP_429_TOO_MANY_REQUESTS: {"model": HTTPExceptionResponseModel},
+    },
 )
 async def register_user(db: AsyncSessionDep, data: UserCreateRequest):
     """
@@ -27,10 +54,13 @@ async def register_user(db: AsyncSessionDep, data: UserCreateRequest):
     **Response:**
     - `200 OK`: User registered successfully.
     - `400 Bad Request`: Username already exists or invalid input.
+    - `429 Too Many Requests`: Too many attempts from this IP or for this email.
     """
-    return {
-        "data": await auth_service.create_user(db, data=data)
-    }
+    return SchemaResponse(
+        BaseResponseModel[UserRead],
+        {"data": await auth_service.create_user(db, data=data)},
+        status_code=status.HTTP_201_CREATED
+    )
 
 
 @auth_router.post(
@@ -39,19 +69,125 @@ async def register_user(db: AsyncSessionDep, data: UserCreateRequest):
     responses={
         status.HTTP_400_BAD_REQUEST: {"model": HTTPExceptionResponseModel},
         status.HTTP_404_NOT_FOUND: {"model": HTTPExceptionResponseModel},
+        status.HTTP_429_TOO_MANY_REQUESTS: {"model": HTTPExceptionResponseModel},
     },
+    dependencies=[Depends(auth_rate_limit("login", TokenRequest))],
 )
 async def get_token(
+    request: Request,
     data: TokenRequest,
     db: AsyncSessionDep
 ):
+    """
+    Log in with email and password.
+
+    Returns a short lived access token and a refresh token. Renew the access
+    token with `/auth/refresh` rather than logging in again.
+    """
     user_obj = await auth_service.authenticate_user(
-        db=db, email=data.email, password=data.password
+        db=db,
+        email=data.email,
+        password=data.password,
+        session_factory=request.app.state.db_session_factory,
     )
 
-    return {
-        "data": {
-            "access_token": user_obj.token,
-            "user": user_obj
-        }
-    }
+    return SchemaResponse(BaseResponseModel[TokenResponse], {
+        "data": await auth_service.issue_tokens(db, user=user_obj)
+    })
+
+
+@auth_router.post(
+    "/auth/refresh",
+    response_model=BaseResponseModel[RefreshTokenResponse],
+    responses={
+        status.HTTP_401_UNAUTHORIZED: {"model": HTTPExceptionResponseModel},
+    },
+)
+async def refresh_token(data: RefreshTokenRequest, db: AsyncSessionDep):
+    """
+    Exchange a refresh token for a new access token.
+
+    The refresh token is rotated: the response carries a new one and the
+    one sent can't be used again. Reusing it revokes the whole session.
+    """
+    return SchemaResponse(BaseResponseModel[RefreshTokenResponse], {
+        "data": await auth_service.refresh_tokens(db, refresh_token=data.refresh_token)
+    })
+
+
+@auth_router.post("/auth/revoke", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_token(data: RefreshTokenRequest, db: AsyncSessionDep):
+    """
+    Log out: revoke a refresh token and every token rotated from the same login.
+    """
+    await auth_service.revoke_refresh_token(db, refresh_token=data.refresh_token)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@user_router.get(
+    "/users",
+    response_model=BaseResponseModel[CursorPaginatedResponse[UserPublic]],
+)
+@cache_response(ttl=30, invalidated_by=[user_repo])
+async def list_users(
+    current_user: CurrentUserDep,
+    page: Annotated[dict, Depends(paginated_list(user_repo, schema=UserPublic))]
+):
+    """
+    List users, one cursor paginated page at a time.
+
+    Pass the `next_cursor` of a response as `cursor` to get the next page.
+    """
+    return RawJSONResponse({
+        "meta": {},
+        "data": page
+    })
+
+
+@user_router.get(
+    "/users/search",
+    response_model=BaseResponseModel[list[dict[str, Any]]],
+)
+@cache_response(ttl=30, invalidated_by=[user_repo])
+async def search_users(
+    db: AsyncSessionDep,
+    current_user: CurrentUserDep,
+    params: FilterParamsDep
+):
+    """
+    Search users with filters, multi-field sorting and field selection.
+
+    Example: `?filter=email:ilike:%@school.org&filter=id:gte:10&sort=-created_at,id&fields=id,email`
+    """
+    return RawJSONResponse({
+        "meta": {},
+        "data": await user_repo.filter_by(
+            db,
+            filters=params.conditions,
+            skip=params.skip,
+            limit=params.limit,
+            order_by=params.sort_fields,
+            fields=params.field_list or user_repo.schema_fields(UserPublic),
+        )
+    })
+
+
+@user_router.get(
+    "/users/export",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {"content": {"text/csv": {}, "application/x-ndjson": {}}},
+    },
+)
+async def export_users(request: Request, current_user: CurrentUserDep, params: ExportParamsDep):
+    """
+    Download users as CSV or NDJSON, with the filters, sorting and field
+    selection of `/users/search`, without any row limit.
+
+    Rows are streamed in batches, so exports of any size use constant memory.
+    For exports too long to hold a request open, queue the `export_users`
+    job with these parameters through `POST /jobs/export_users` instead.
+    """
+    return await export_records(
+        request, user_repo, params, default_fields=user_repo.schema_fields(UserPublic), filename="users"
+    )
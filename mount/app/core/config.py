@@ -6,9 +6,116 @@ class Settings(BaseSettings):
     app_env: str = "dev"
 
     db_url: str = ""
+    # Read replicas, e.g. DB_REPLICA_URLS='["postgresql+asyncpg://...replica1/db"]'
+    db_replica_urls: list[str] = []
+    # Reads stay on the primary this long after a user's write
+    db_sticky_primary_seconds: float = 5.0
+
+    # Connection pool profile, sized per worker process
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_pool_use_lifo: bool = True
+    db_query_cache_size: int = 500
+    db_prepared_statement_cache_size: int = 100
+
+    # Query profiler: slow query log and repeated statement (N+1) detection
+    query_profiler_enabled: bool = True
+    slow_query_threshold_ms: float = 200.0
+    slow_query_explain: bool = True
+    repeated_query_threshold: int = 10
+    # Raise instead of logging repeated statements, for test runs
+    repeated_query_raise: bool = False
+
+    # Entries of the identity cache, shared by repositories opting in with
+    # `identity_cache_ttl`
+    identity_cache_size: int = 10000
+
+    # Rows fetched per round trip by streamed exports
+    export_batch_size: int = 1000
+    # Files written by export jobs, shared by the API and the worker, and
+    # deleted this long after they were written
+    export_dir: str = "exports"
+    export_file_ttl_seconds: float = 24 * 60 * 60
+
+    # Rows per statement for bulk writes
+    bulk_chunk_size: int = 1000
+
+    # Total counts for paginated listings
+    count_cache_ttl_seconds: int = 60
+    count_estimate_min_rows: int = 10000
 
     jwt_secret_key: str = ""
-    jwt_expiration_minutes: int = 30
+    # Access tokens are short lived, clients renew them with a refresh token
+    jwt_expiration_minutes: int = 15
+    jwt_algorithm: str = "HS256"
+    # "jose", "pyjwt" or "hmac", the fastest, for HS256/384/512 only
+    jwt_backend: str = "jose"
+    jwt_verify_cache_size: int = 4096
+    refresh_token_expiration_days: int = 30
+
+    # Authenticated users are cached per worker to skip the lookup query
+    auth_user_cache_size: int = 1024
+    auth_user_cache_ttl_seconds: int = 60
+    # Build the current user from the token claims without touching the DB
+    auth_trust_token_claims: bool = False
+
+    # "thread" or "process"
+    password_hash_executor: str = "thread"
+    password_hash_max_workers: int = 4
+    password_hash_max_pending: int = 64
+    # bcrypt cost of new hashes. With calibration enabled each worker picks
+    # the highest cost within the target latency at startup instead, so
+    # workers may disagree by a round; pin the logged result here to make
+    # them all agree
+    password_hash_rounds: int = 12
+    password_hash_calibrate: bool = False
+    password_hash_target_ms: float = 250.0
+    password_hash_min_rounds: int = 10
+    password_hash_max_rounds: int = 16
+    # Rehash in the background on login when the stored cost is lower
+    password_rehash_on_login: bool = True
+
+    # Token buckets guarding the login and registration endpoints
+    rate_limit_enabled: bool = True
+    # "memory" (per worker) or "redis" (shared, needs the redis package)
+    rate_limit_backend: str = "memory"
+    rate_limit_redis_url: str = "redis://localhost:6379/0"
+    rate_limit_max_keys: int = 100_000
+    auth_rate_limit_ip_capacity: int = 20
+    auth_rate_limit_ip_per_minute: float = 10.0
+    auth_rate_limit_email_capacity: int = 5
+    auth_rate_limit_email_per_minute: float = 2.0
+
+    # Cached GET responses of routes marked with cache_response
+    response_cache_enabled: bool = True
+    # "memory" (per worker) or "redis" (shared, needs the redis package)
+    response_cache_backend: str = "memory"
+    response_cache_redis_url: str = "redis://localhost:6379/0"
+    response_cache_max_entries: int = 1024
+
+    # Background jobs, run by `python -m app.jobs.worker`
+    job_worker_concurrency: int = 4
+    job_poll_interval_seconds: float = 1.0
+    job_max_attempts: int = 5
+    # Retry delays double from the base up to the max, with jitter
+    job_retry_base_seconds: float = 5.0
+    job_retry_max_seconds: float = 900.0
+    # Running jobs locked longer than this are assumed lost and recovered
+    job_lock_timeout_seconds: float = 600.0
+    # Purge jobs are queued again this long after each run
+    job_purge_interval_seconds: float = 3600.0
+
+    log_level: str = "INFO"
+    log_json: bool = True
+    log_file: str | None = "app.log"
+    log_file_max_bytes: int = 10 * 1024 * 1024
+    log_file_backup_count: int = 5
+    # Sampling and rate limiting of hot path logs such as the access log
+    log_hot_path_sample_rate: float = 1.0
+    log_hot_path_max_per_second: int = 0
 
     model_config = SettingsConfigDict(env_file=".env")
 
@@ -0,0 +1,154 @@
+import csv
+import io
+import time
+import uuid
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable
+
+import orjson
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.schemas.filter_schema import ExportFormat, ExportParams
+
+Batches = AsyncIterator[list[dict[str, Any]]]
+
+
+def encode_csv(rows: list[dict[str, Any]], fields: list[str], header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction="ignore")
+    if header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def encode_ndjson(rows: list[dict[str, Any]], fields: list[str], header: bool = False) -> bytes:
+    return b"".join(orjson.dumps(row) + b"\n" for row in rows)
+
+
+EXPORT_ENCODERS: dict[ExportFormat, tuple[Callable[..., bytes], str]] = {
+    ExportFormat.CSV: (encode_csv, "text/csv"),
+    ExportFormat.NDJSON: (encode_ndjson, "application/x-ndjson"),
+}
+
+
+async def export_response(
+    batches: Batches, *, fields: list[str], format: ExportFormat, filename: str
+) -> StreamingResponse:
+    """
+    Stream row batches, e.g. from `BaseRepository.stream`, as a CSV or
+    NDJSON download, encoding one batch at a time.
+
+    The first batch is fetched before responding, so invalid queries still
+    get a regular error response instead of a truncated download.
+    """
+    encode, media_type = EXPORT_ENCODERS[format]
+    first = await anext(batches, [])
+
+    async def body():
+        yield encode(first, fields, header=True)
+        async for rows in batches:
+            yield encode(rows, fields)
+
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format.value}"'},
+    )
+
+
+async def export_records(
+    request: Request, repository, params: ExportParams, *, default_fields: list[str], filename: str
+) -> StreamingResponse:
+    """
+    Stream every `repository` record matching the export query parameters
+    as a download, `default_fields` being exported unless `fields` is given
+
+    Rows are read through a server-side cursor in a session of their own,
+    since the request's session is closed before a streaming body is sent
+    """
+    fields = params.field_list or default_fields
+
+    async def batches():
+        async with request.app.state.db_session_factory() as db:
+            async for rows in repository.stream(
+                db,
+                filters=params.conditions,
+                order_by=params.sort_fields or "id",
+                fields=fields,
+            ):
+                yield rows
+
+    return await export_response(batches(), fields=fields, format=params.format, filename=filename)
+
+
+async def write_export(
+    db: AsyncSession, repository, params: ExportParams, *, default_fields: list[str], filename: str
+) -> dict[str, Any]:
+    """
+    Write every `repository` record matching the export query parameters
+    to a new file in `export_dir`, for exports run as background jobs
+
+    Rows go to a `.part` file renamed once complete, so a failed attempt
+    never leaves a truncated export behind
+    Returns the job result: the stored `file`, the download `filename`,
+    its `media_type` and the number of `rows`
+    """
+    fields = params.field_list or default_fields
+    encode, media_type = EXPORT_ENCODERS[params.format]
+    directory = Path(get_settings().export_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    name = f"{uuid.uuid4().hex}.{params.format.value}"
+    partial = directory / f"{name}.part"
+    rows = 0
+    try:
+        with partial.open("wb") as file:
+            file.write(encode([], fields, header=True))
+            async for batch in repository.stream(
+                db,
+                filters=params.conditions,
+                order_by=params.sort_fields or "id",
+                fields=fields,
+            ):
+                file.write(encode(batch, fields))
+                rows += len(batch)
+        partial.rename(directory / name)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+
+    return {
+        "file": name,
+        "filename": f"{filename}.{params.format.value}",
+        "media_type": media_type,
+        "rows": rows,
+    }
+
+
+def export_file(name: str) -> Path | None:
+    """Path of a file written by `write_export`, None once it was purged"""
+    path = Path(get_settings().export_dir) / Path(name).name
+    return path if path.is_file() else None
+
+
+def purge_export_files(max_age_seconds: float) -> int:
+    """
+    Delete export files, complete or not, written more than
+    `max_age_seconds` ago
+    Returns the number of deleted files
+    """
+    directory = Path(get_settings().export_dir)
+    if not directory.is_dir():
+        return 0
+
+    written_before = time.time() - max_age_seconds
+    deleted = 0
+    for path in directory.iterdir():
+        if path.is_file() and path.stat().st_mtime < written_before:
+            path.unlink(missing_ok=True)
+            deleted += 1
+    return deleted
@@ -0,0 +1,185 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+import bcrypt
+
+from app.core.config import get_settings
+from app.exceptions.server_exception import ServiceBusyException
+
+
+def hash_password(password: str, rounds: int = 12) -> str:
+    """Hash a password with a freshly generated bcrypt salt of cost `rounds`"""
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds)).decode()
+
+
+def check_password(password: str, password_hash: str) -> bool:
+    """Check a password against a stored bcrypt hash"""
+    return bcrypt.checkpw(password.encode(), password_hash.encode())
+
+
+def hash_rounds(password_hash: str) -> int | None:
+    """Cost a bcrypt hash was made with, read from its `$2b$<rounds>$` prefix"""
+    try:
+        return int(password_hash.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def calibrate_rounds(target_ms: float, min_rounds: int = 10, max_rounds: int = 16) -> int:
+    """
+    Highest bcrypt cost whose hashing time stays within `target_ms` on this
+    machine, clamped to `[min_rounds, max_rounds]`.
+
+    Each extra round doubles the work, so the time at `min_rounds` (best of
+    three, to ignore noise) is enough to extrapolate the other costs.
+    """
+    samples = []
+    for _ in range(3):
+        started = time.perf_counter()
+        hash_password("calibration", min_rounds)
+        samples.append((time.perf_counter() - started) * 1000)
+
+    rounds, elapsed_ms = min_rounds, min(samples)
+    while rounds < max_rounds and elapsed_ms * 2 <= target_ms:
+        rounds += 1
+        elapsed_ms *= 2
+    return rounds
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a worker pool so the event loop never blocks on hashing.
+
+    Concurrency is bounded by the pool size, and callers waiting for a free
+    worker are bounded by `max_pending`. Once that queue is full new calls
+    are rejected straight away with `ServiceBusyException` instead of piling
+    up behind a login burst.
+
+    New hashes use cost `rounds`, which `calibrate` can derive from a target
+    latency at startup. `needs_rehash` tells when a stored hash was made
+    with a lower cost.
+    """
+
+    def __init__(
+        self,
+        *,
+        executor: str = "thread",
+        max_workers: int = 4,
+        max_pending: int = 64,
+        rounds: int = 12,
+    ):
+        self.executor_type = executor
+        self.rounds = rounds
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+
+        self._executor: Executor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+        self._waiting = 0
+        self._in_flight = 0
+        self._rejected = 0
+        self._completed = 0
+        self._total_seconds = 0.0
+        self._max_seconds = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        return self._semaphore
+
+    async def _run(self, func, *args):
+        if self._waiting >= self.max_pending:
+            self._rejected += 1
+            raise ServiceBusyException()
+
+        semaphore = self._get_semaphore()
+        self._waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._in_flight += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            elapsed = time.perf_counter() - started
+            self._in_flight -= 1
+            self._completed += 1
+            self._total_seconds += elapsed
+            self._max_seconds = max(self._max_seconds, elapsed)
+            semaphore.release()
+
+    async def hash(self, password: str) -> str:
+        """Hash a password without blocking the event loop"""
+        return await self._run(hash_password, password, self.rounds)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        """Verify a password without blocking the event loop"""
+        return await self._run(check_password, password, password_hash)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """
+        Whether a stored hash was made with a cost lower than `rounds`.
+
+        Hashes are only ever upgraded: workers calibrated to different costs
+        would otherwise keep rewriting each other's hashes on every login
+        """
+        stored = hash_rounds(password_hash)
+        return stored is not None and stored < self.rounds
+
+    async def calibrate(self, *, target_ms: float, min_rounds: int = 10, max_rounds: int = 16) -> int:
+        """
+        Measure bcrypt on a pool worker and switch `rounds` to the highest
+        cost within `target_ms`
+        Returns the new cost
+        """
+        loop = asyncio.get_running_loop()
+        self.rounds = await loop.run_in_executor(
+            self._get_executor(), calibrate_rounds, target_ms, min_rounds, max_rounds
+        )
+        return self.rounds
+
+    def stats(self) -> dict:
+        """Queue depth and latency figures for the hashing pool"""
+        return {
+            "executor": self.executor_type,
+            "rounds": self.rounds,
+            "max_workers": self.max_workers,
+            "queue_depth": self._waiting,
+            "in_flight": self._in_flight,
+            "rejected": self._rejected,
+            "completed": self._completed,
+            "avg_latency_ms": (
+                self._total_seconds / self._completed * 1000 if self._completed else 0.0
+            ),
+            "max_latency_ms": self._max_seconds * 1000,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._semaphore = None
+
+
+password_hasher = PasswordHasher(
+    executor=get_settings().password_hash_executor,
+    max_workers=get_settings().password_hash_max_workers,
+    max_pending=get_settings().password_hash_max_pending,
+    rounds=get_settings().password_hash_rounds,
+)
@@ -1,61 +1,165 @@
+import atexit
+import json
 import logging
+import queue
+import random
 import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from typing import Optional
 
+from app.core.config import get_settings
+
 # Logger configuration
 LOG_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
-LOG_LEVEL = logging.INFO  # Adjust as needed
-LOG_FILE: Optional[str] = "app.log"  # e.g., "app.log" to enable file logging
+LOG_LEVEL = getattr(logging, get_settings().log_level.upper(), logging.INFO)
+LOG_FILE: Optional[str] = get_settings().log_file  # e.g., "app.log" to enable file logging
+
+# Attributes every LogRecord has, anything else was passed through `extra`
+_RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime", "hot_path"}
 
 logger = logging.getLogger("school_logger")
 logger.setLevel(LOG_LEVEL)
+logger.propagate = False
 
 # Disable uvicorn logger
 uvicorn_access = logging.getLogger("uvicorn.access")
 uvicorn_access.disabled = True
 
+
+class JSONFormatter(logging.Formatter):
+    """Formats records as one JSON object per line, including `extra` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class HotPathFilter(logging.Filter):
+    """
+    Samples and rate limits records logged with `hot_path=True`, such as the
+    per-request access log. Warnings and errors always pass
+    """
+
+    def __init__(self, *, sample_rate: float = 1.0, max_per_second: int = 0):
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.max_per_second = max_per_second
+        self._lock = threading.Lock()
+        self._window = 0
+        self._count = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "hot_path", False) or record.levelno >= logging.WARNING:
+            return True
+
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return False
+
+        if self.max_per_second > 0:
+            with self._lock:
+                window = int(time.monotonic())
+                if window != self._window:
+                    self._window, self._count = window, 0
+                self._count += 1
+                if self._count > self.max_per_second:
+                    return False
+        return True
+
+
+class _QueueHandler(QueueHandler):
+    """
+    Queue handler which keeps the exception text apart from the message, so
+    the listener side can still format records as structured JSON
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.stack_info = None
+        return record
+
+
 if not logger.handlers:
-    formatter = logging.Formatter(LOG_FORMAT)
+    formatter = JSONFormatter() if get_settings().log_json else logging.Formatter(LOG_FORMAT)
 
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers: list[logging.Handler] = [console_handler]
 
     if LOG_FILE:
-        file_handler = logging.FileHandler(LOG_FILE)
+        file_handler = RotatingFileHandler(
+            LOG_FILE,
+            maxBytes=get_settings().log_file_max_bytes,
+            backupCount=get_settings().log_file_backup_count,
+        )
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    # Writes happen on the listener thread, never on the event loop
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(HotPathFilter(
+        sample_rate=get_settings().log_hot_path_sample_rate,
+        max_per_second=get_settings().log_hot_path_max_per_second,
+    ))
+    logger.addHandler(queue_handler)
+
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
 
 # Logging convenience functions
-def debug(msg: str):
+def debug(msg: str, **fields):
     """Log a debug level message."""
-    logger.debug(msg)
+    logger.debug(msg, extra=fields)
 
-def info(msg: str):
+def info(msg: str, **fields):
     """Log an info level message."""
-    logger.info(msg)
+    logger.info(msg, extra=fields)
 
-def warning(msg: str):
+def warning(msg: str, **fields):
     """Log a warning level message."""
-    logger.warning(msg)
+    logger.warning(msg, extra=fields)
 
-def error(msg: str):
+def error(msg: str, **fields):
     """Log an error level message."""
-    logger.error(msg)
+    logger.error(msg, extra=fields)
 
-def critical(msg: str):
+def critical(msg: str, **fields):
     """Log a critical level message."""
-    logger.critical(msg)
+    logger.critical(msg, extra=fields)
+
+def hot_path(msg: str, **fields):
+    """Log an info level message from a hot path, subject to sampling and rate limiting."""
+    logger.info(msg, extra={**fields, "hot_path": True})
 
-def exception(msg: str, exc: Optional[Exception] = None):
+def exception(msg: str, exc: Optional[Exception] = None, **fields):
     """
     Log an exception with traceback.
 
     Args:
         msg (str): Custom message to log with the exception.
         exc (Exception, optional): The exception instance (if available). If not provided, logs the current exception.
+        **fields: Extra structured fields to log with the record.
     """
     if exc:
-        logger.error(f"{msg}: {str(exc)}", exc_info=exc)
+        logger.error(f"{msg}: {str(exc)}", exc_info=exc, extra=fields)
     else:
-        logger.error(msg, exc_info=True)
+        logger.error(msg, exc_info=True, extra=fields)
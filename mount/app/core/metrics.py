@@ -0,0 +1,104 @@
+import bisect
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """Minimal Prometheus histogram, rendered in the text exposition format"""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...], buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        # labels -> [per bucket counts..., +Inf count], sum
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        counts, total = series
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in self._series.items():
+            label_text = ",".join(
+                f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, labels)
+            )
+            prefix = f"{label_text}," if label_text else ""
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {total[0]}")
+            lines.append(f"{self.name}_count{{{label_text}}} {cumulative}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+@dataclass
+class RequestStats:
+    """Database work done while serving one request"""
+    started: float = field(default_factory=time.perf_counter)
+    db_seconds: float = 0.0
+    db_queries: int = 0
+    # statement fingerprint -> executions, for spotting N+1 patterns
+    statement_counts: dict[str, int] = field(default_factory=dict)
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def start_request() -> RequestStats:
+    stats = RequestStats()
+    _request_stats.set(stats)
+    return stats
+
+
+def current_request_stats() -> RequestStats | None:
+    return _request_stats.get()
+
+
+def record_query(elapsed: float) -> None:
+    """Count a SQL statement against the current request, if any"""
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.db_seconds += elapsed
+        stats.db_queries += 1
+
+
+request_duration = Histogram(
+    "http_request_duration_seconds", "Total request latency",
+    ("method", "route", "status"),
+)
+request_db_duration = Histogram(
+    "http_request_db_duration_seconds", "Time spent executing SQL per request",
+    ("method", "route"),
+)
+request_db_queries = Histogram(
+    "http_request_db_queries", "SQL statements executed per request",
+    ("method", "route"), buckets=QUERY_COUNT_BUCKETS,
+)
+
+
+def observe_request(method: str, route: str, status: int, stats: RequestStats) -> None:
+    request_duration.observe((method, route, str(status)), time.perf_counter() - stats.started)
+    request_db_duration.observe((method, route), stats.db_seconds)
+    request_db_queries.observe((method, route), stats.db_queries)
+
+
+def render() -> str:
+    lines = []
+    for histogram in (request_duration, request_db_duration, request_db_queries):
+        lines.extend(histogram.render())
+    return "\n".join(lines) + "\n"
@@ -1,26 +1,125 @@
+import time
+from uuid import uuid4
+
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
-from app.core import logger
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core import logger, metrics
+from app.core.responses import AppJSONResponse
 from app.core.config import get_settings
 from app.exceptions.base_exception import AppBaseException
 
+class RequestIDMiddleware:
+    """
+    Takes the request id from the `X-Request-ID` header or generates one,
+    exposes it as `request.state.request_id` and echoes it on the response
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get("x-request-id") or uuid4().hex
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            await send(message)
+
+        await self.app(scope, receive, send_with_request_id)
+
+
+class RequestMetricsMiddleware:
+    """
+    Records latency, DB time and query count of every request into the
+    `/metrics` histograms, labelled by route template
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = metrics.start_request()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Label by route template, not the raw path, to keep cardinality bounded
+            route = scope.get("route")
+            metrics.observe_request(
+                scope["method"], getattr(route, "path", "unmatched"), status_code, stats
+            )
+
+
+class RequestLoggingMiddleware:
+    """
+    Writes one structured access log line per request once the response
+    has started
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            stats = metrics.current_request_stats()
+            logger.hot_path(
+                "request",
+                request_id=scope.get("state", {}).get("request_id"),
+                method=scope["method"],
+                path=scope["path"],
+                status=status_code,
+                latency_ms=round((time.perf_counter() - started) * 1000, 2),
+                db_ms=round(stats.db_seconds * 1000, 2) if stats else None,
+                db_queries=stats.db_queries if stats else None,
+            )
+
+
 def init_middlewares(app: FastAPI):
     """
     Initialize all middlewares
-    NOTE: All middlewares will run in order from top to bottom
+    NOTE: Requests pass through the middlewares in this order:
+    RequestID -> RequestMetrics -> RequestLogging -> CORS -> routes.
+    All of them are pure ASGI, `@app.middleware("http")` must not be used
 
     Args:
         app (FastAPI): FastAPI app instance
     """
 
-    @app.middleware("http")
-    async def request_logging(request: Request, call_next):
-        logger.info(f"{request.method} {request.url}")
-        response = await call_next(request)
-        return response
-    
+    # add_middleware wraps the existing stack, so add from innermost to outermost
     if get_settings().app_env == "dev":
         # Allow all origins in development
         app.add_middleware(
@@ -39,7 +138,11 @@ def init_middlewares(app: FastAPI):
             allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
             allow_headers=["*"],
         )
-    
+
+    app.add_middleware(RequestLoggingMiddleware)
+    app.add_middleware(RequestMetricsMiddleware)
+    app.add_middleware(RequestIDMiddleware)
+
 
 def init_exception_middlewares(app: FastAPI):
     """
@@ -60,10 +163,10 @@ def init_exception_middlewares(app: FastAPI):
             exc (HTTPException): FastAPI HTTPException
 
         Returns:
-            JSONResponse: Response with error data
+            AppJSONResponse: Response with error data
         """
         logger.exception("Invalid Request Body", exc)
-        return JSONResponse(
+        return AppJSONResponse(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             content={
                 "error": {
@@ -83,10 +186,10 @@ def init_exception_middlewares(app: FastAPI):
             exc (HTTPException): FastAPI HTTPException
 
         Returns:
-            JSONResponse: Response with error data
+            AppJSONResponse: Response with error data
         """
         logger.exception("Custom Exceptions", exc)
-        return JSONResponse(
+        return AppJSONResponse(
             status_code=exc.status_code,
             content={
                 "error": {
@@ -106,17 +209,22 @@ def init_exception_middlewares(app: FastAPI):
             exc (HTTPException): FastAPI HTTPException
 
         Returns:
-            JSONResponse: Response with error data
+            AppJSONResponse: Response with error data
         """
-        logger.exception("App Exception", exc)
-        return JSONResponse(
+        if exc.status_code == status.HTTP_429_TOO_MANY_REQUESTS:
+            # Expected under attack, keep rejections cheap
+            logger.warning("Rate limited", path=request.url.path, client=request.client and request.client.host)
+        else:
+            logger.exception("App Exception", exc)
+        return AppJSONResponse(
             status_code=exc.status_code,
             content={
                 "error": {
                     "code": exc.error_code,
                     "detail": exc.detail
                 }
-            }
+            },
+            headers=exc.headers
         )
     
     @app.exception_handler(Exception)
@@ -129,10 +237,10 @@ def init_exception_middlewares(app: FastAPI):
             exc (HTTPException): FastAPI HTTPException
 
         Returns:
-            JSONResponse: Response with error data
+            AppJSONResponse: Response with error data
         """
         logger.exception("Unhandled exception", exc)
-        return JSONResponse(
+        return AppJSONResponse(
             status_code=500,
             content={
                 "error": {
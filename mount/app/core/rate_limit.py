@@ -0,0 +1,148 @@
+import math
+import time
+from collections import OrderedDict
+from typing import Protocol
+
+from app.core.config import get_settings
+from app.exceptions.server_exception import TooManyRequestsException
+
+
+class RateLimitBackend(Protocol):
+    async def consume(self, key: str, *, capacity: int, refill_per_second: float) -> float:
+        """Take one token from the bucket at `key`, returning 0 or the seconds until one is available"""
+        ...
+
+
+class MemoryBackend:
+    """
+    Token buckets held in process, the default backend.
+
+    Each worker process keeps its own buckets, so the effective limit is
+    multiplied by the number of workers. Least recently used buckets are
+    dropped past `max_keys`, which only ever resets them to full.
+    """
+
+    def __init__(self, *, max_keys: int = 100_000, **_):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def consume(self, key, *, capacity, refill_per_second):
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * refill_per_second)
+
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / refill_per_second
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+
+class RedisBackend:
+    """
+    Token buckets shared by all workers through a Redis compatible server
+    (Redis, Valkey, a local stand-in...). Requires `redis` installed.
+
+    The refill and take happen in one Lua script, so concurrent workers
+    can't both spend the last token.
+    """
+
+    SCRIPT = """
+    local now = redis.call('TIME')
+    now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(bucket[1]) or capacity
+    local updated = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+    local retry_after = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+    else
+        retry_after = (1 - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return tostring(retry_after)
+    """
+
+    def __init__(self, *, redis_url: str, key_prefix: str = "rate_limit:", **_):
+        from redis.asyncio import Redis
+
+        self._client = Redis.from_url(redis_url)
+        self._script = self._client.register_script(self.SCRIPT)
+        self.key_prefix = key_prefix
+
+    async def consume(self, key, *, capacity, refill_per_second):
+        result = await self._script(keys=[self.key_prefix + key], args=[capacity, refill_per_second])
+        return float(result)
+
+
+RATE_LIMIT_BACKENDS: dict[str, type[RateLimitBackend]] = {
+    "memory": MemoryBackend,
+    "redis": RedisBackend,
+}
+
+
+class RateLimiter:
+    """
+    Token bucket rate limiting keyed by arbitrary strings, such as a client
+    IP or an email address.
+
+    A bucket holds up to `capacity` tokens and regains `per_minute` of them
+    every minute. Each hit takes one token; a hit on an empty bucket raises
+    `TooManyRequestsException` carrying the seconds to wait.
+    """
+
+    def __init__(self, *, enabled: bool = True, backend: str = "memory", **backend_options):
+        self.enabled = enabled
+        self.backend_name = backend
+        self._backend_options = backend_options
+        self._backend: RateLimitBackend | None = None
+        self.allowed = 0
+        self.rejected = 0
+
+    def _get_backend(self) -> RateLimitBackend:
+        if self._backend is None:
+            self._backend = RATE_LIMIT_BACKENDS[self.backend_name](**self._backend_options)
+        return self._backend
+
+    async def hit(self, key: str, *, capacity: int, per_minute: float) -> None:
+        """
+        Take a token from the bucket at `key`
+
+        Raises:
+            TooManyRequestsException: if the bucket is empty.
+        """
+        if not self.enabled:
+            return
+
+        retry_after = await self._get_backend().consume(
+            key, capacity=capacity, refill_per_second=per_minute / 60
+        )
+        if retry_after > 0:
+            self.rejected += 1
+            raise TooManyRequestsException(retry_after=math.ceil(retry_after))
+        self.allowed += 1
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend_name,
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+        }
+
+
+rate_limiter = RateLimiter(
+    enabled=get_settings().rate_limit_enabled,
+    backend=get_settings().rate_limit_backend,
+    max_keys=get_settings().rate_limit_max_keys,
+    redis_url=get_settings().rate_limit_redis_url,
+)
@@ -0,0 +1,312 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Callable, Protocol
+
+from fastapi import Request, Response, status
+from fastapi.routing import APIRoute
+
+from app.core import logger
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.core.tokens import TokenError, token_manager
+from app.services import auth_service
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+    status_code: int
+    media_type: str | None
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    ttl: float
+    tags: tuple[str, ...]
+    vary_user: bool
+
+
+class ResponseCacheBackend(Protocol):
+    async def get(self, key: str) -> CachedResponse | None: ...
+
+    async def set(self, key: str, value: CachedResponse, ttl: float) -> None: ...
+
+    async def versions(self, tags: tuple[str, ...]) -> list[int]:
+        """Current version of each tag, bumped by `invalidate`"""
+        ...
+
+    async def invalidate(self, tag: str) -> None: ...
+
+
+class MemoryBackend:
+    """
+    Per worker LRU of responses, the default backend.
+
+    Invalidating a tag bumps its version, which is part of the cache keys,
+    so stale entries are never served again and age out of the LRU.
+    """
+
+    def __init__(self, *, max_entries: int = 1024, **_):
+        self._entries: TTLCache[str, CachedResponse] = TTLCache(maxsize=max_entries, ttl=60)
+        self._versions: dict[str, int] = {}
+
+    async def get(self, key):
+        return self._entries.get(key)
+
+    async def set(self, key, value, ttl):
+        self._entries.set(key, value, ttl=ttl)
+
+    async def versions(self, tags):
+        return [self._versions.get(tag, 0) for tag in tags]
+
+    async def invalidate(self, tag):
+        self._versions[tag] = self._versions.get(tag, 0) + 1
+
+
+class RedisBackend:
+    """
+    Responses and tag versions shared by all workers through a Redis
+    compatible server, so a write on one worker invalidates them all.
+    Requires `redis` installed.
+    """
+
+    def __init__(self, *, redis_url: str, key_prefix: str = "response_cache:", **_):
+        from redis.asyncio import Redis
+
+        self._client = Redis.from_url(redis_url)
+        self.key_prefix = key_prefix
+
+    async def get(self, key):
+        entry = await self._client.hgetall(self.key_prefix + key)
+        if not entry:
+            return None
+        return CachedResponse(
+            body=entry[b"body"],
+            etag=entry[b"etag"].decode(),
+            status_code=int(entry[b"status_code"]),
+            media_type=entry[b"media_type"].decode() or None,
+        )
+
+    async def set(self, key, value, ttl):
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.hset(self.key_prefix + key, mapping={
+                "body": value.body,
+                "etag": value.etag,
+                "status_code": value.status_code,
+                "media_type": value.media_type or "",
+            })
+            pipe.expire(self.key_prefix + key, max(1, int(ttl)))
+            await pipe.execute()
+
+    async def versions(self, tags):
+        if not tags:
+            return []
+        values = await self._client.mget([f"{self.key_prefix}version:{tag}" for tag in tags])
+        return [int(value or 0) for value in values]
+
+    async def invalidate(self, tag):
+        await self._client.incr(f"{self.key_prefix}version:{tag}")
+
+
+def etag_matches(etag: str, if_none_match: str) -> bool:
+    """
+    Whether `etag` is one of the entity tags listed in an `If-None-Match`
+    header, or the header is `*`. Weak comparison, as the header requires
+    """
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque_tag for tag in if_none_match.split(","))
+
+
+RESPONSE_CACHE_BACKENDS: dict[str, type[ResponseCacheBackend]] = {
+    "memory": MemoryBackend,
+    "redis": RedisBackend,
+}
+
+
+class ResponseCache:
+    """
+    Caches successful GET responses of routes marked with `cache_response`.
+
+    Keys combine the path, the query parameters, the user when the route
+    varies by user, and the versions of the route's tags. Each cached
+    response carries an ETag, and a request whose `If-None-Match` matches
+    gets an empty 304 instead, whether the response came from the cache or
+    was just rendered.
+    """
+
+    def __init__(self, *, enabled: bool = True, backend: str = "memory", **backend_options):
+        self.enabled = enabled
+        self.backend_name = backend
+        self._backend_options = backend_options
+        self._backend: ResponseCacheBackend | None = None
+        self._watched: set[str] = set()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    @property
+    def backend(self) -> ResponseCacheBackend:
+        if self._backend is None:
+            self._backend = RESPONSE_CACHE_BACKENDS[self.backend_name](**self._backend_options)
+        return self._backend
+
+    def watch(self, repository) -> str:
+        """
+        Invalidate the tag of `repository`, its table name, on every write
+        through it, before the write returns
+        Returns the tag
+        """
+        tag = repository.model.__tablename__
+        if tag not in self._watched:
+            self._watched.add(tag)
+            repository.add_change_listener(lambda: self.invalidate(tag))
+        return tag
+
+    async def invalidate(self, tag: str) -> None:
+        # The write is already committed, failing it now would only hide that
+        try:
+            await self.backend.invalidate(tag)
+        except Exception as exc:
+            logger.exception("Response cache invalidation failed", exc, tag=tag)
+
+    async def _cache_key(self, request: Request, policy: CachePolicy) -> str | None:
+        user = ""
+        if policy.vary_user:
+            scheme, _, credentials = request.headers.get("authorization", "").partition(" ")
+            if scheme.lower() != "bearer":
+                return None
+            try:
+                claims = token_manager.decode(credentials)
+            except TokenError:
+                return None
+
+            # A hit never runs the endpoint's dependencies, so check here that
+            # the token's user still exists, the way get_current_user does
+            async with request.app.state.db_session_factory() as db:
+                try:
+                    current_user = await auth_service.get_current_user(db, claims=claims)
+                except (KeyError, ValueError):
+                    return None
+            if current_user is None:
+                return None
+            user = str(current_user.id)
+
+        versions = await self.backend.versions(policy.tags)
+        parts = [
+            request.url.path,
+            repr(sorted(request.query_params.multi_items())),
+            user,
+            repr(list(zip(policy.tags, versions))),
+        ]
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+    async def serve(self, request: Request, policy: CachePolicy, handler: Callable) -> Response:
+        """Answer `request` from the cache, or through `handler` caching its response"""
+        if not self.enabled or request.method != "GET":
+            return await handler(request)
+
+        # Unauthenticated requests skip the cache and fail in the handler
+        key = await self._cache_key(request, policy)
+        if key is None:
+            return await handler(request)
+
+        cached = await self.backend.get(key)
+        if cached is not None:
+            self.hits += 1
+            return self._respond(request, policy, cached, "HIT")
+
+        self.misses += 1
+        response = await handler(request)
+        if response.status_code != status.HTTP_200_OK or not hasattr(response, "body"):
+            return response
+
+        cached = CachedResponse(
+            body=response.body,
+            etag=f'"{hashlib.blake2b(response.body, digest_size=16).hexdigest()}"',
+            status_code=response.status_code,
+            media_type=response.media_type,
+        )
+        await self.backend.set(key, cached, policy.ttl)
+        return self._respond(request, policy, cached, "MISS")
+
+    def _respond(self, request: Request, policy: CachePolicy, cached: CachedResponse, outcome: str) -> Response:
+        headers = {
+            "ETag": cached.etag,
+            # Clients must revalidate every reuse, a write invalidates the
+            # cache here but never a copy they kept
+            "Cache-Control": f"{'private' if policy.vary_user else 'public'}, no-cache",
+            "X-Cache": outcome,
+        }
+        if policy.vary_user:
+            headers["Vary"] = "Authorization"
+
+        if etag_matches(cached.etag, request.headers.get("if-none-match", "")):
+            self.not_modified += 1
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(
+            cached.body,
+            status_code=cached.status_code,
+            media_type=cached.media_type,
+            headers=headers,
+        )
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend_name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+        }
+
+
+response_cache = ResponseCache(
+    enabled=get_settings().response_cache_enabled,
+    backend=get_settings().response_cache_backend,
+    max_entries=get_settings().response_cache_max_entries,
+    redis_url=get_settings().response_cache_redis_url,
+)
+
+
+def cache_response(*, ttl: float, invalidated_by: list = (), vary_user: bool = True):
+    """
+    Mark an endpoint's GET responses as cacheable, for routers using
+    `CachedRoute`. Place it below the router decorator.
+
+    Args:
+        ttl (float): seconds a response is served from the cache
+        invalidated_by (list[BaseRepository]): repositories whose writes
+            invalidate the cached responses
+        vary_user (bool): cache per authenticated user. Requests without a
+            valid bearer token, or whose user no longer exists, are never
+            served from the cache
+    """
+    tags = tuple(response_cache.watch(repository) for repository in invalidated_by)
+    policy = CachePolicy(ttl=ttl, tags=tags, vary_user=vary_user)
+
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.__cache_policy__ = policy
+        return endpoint
+
+    return decorator
+
+
+class CachedRoute(APIRoute):
+    """
+    Route which serves endpoints marked with `cache_response` through the
+    response cache. The lookup happens before dependencies are solved, so a
+    hit runs no query at all
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Any]:
+        handler = super().get_route_handler()
+        policy: CachePolicy | None = getattr(self.endpoint, "__cache_policy__", None)
+        if policy is None:
+            return handler
+
+        async def cached_route_handler(request: Request) -> Response:
+            return await response_cache.serve(request, policy, handler)
+
+        return cached_route_handler
@@ -0,0 +1,56 @@
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse, Response
+from pydantic import TypeAdapter
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class AppJSONResponse(JSONResponse):
+    """
+    Default response class of the app, encodes with orjson
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class RawJSONResponse(AppJSONResponse):
+    """
+    JSON response for content which is already plain data, such as the
+    dicts returned by `BaseRepository` row mode. Returning it from an endpoint
+    skips validating the content against the route's response model
+    """
+
+
+@lru_cache(maxsize=None)
+def response_adapter(schema: Any) -> TypeAdapter:
+    """TypeAdapter of a response schema, built once per schema"""
+    return TypeAdapter(schema)
+
+
+class SchemaResponse(Response):
+    """
+    Validates content against `schema` and encodes it to JSON in one pass
+    through pydantic-core, instead of FastAPI validating into python objects
+    and then encoding those
+
+    Usage: `SchemaResponse(BaseResponseModel[UserRead], {"data": user_obj})`
+    """
+
+    media_type = "application/json"
+
+    def __init__(self, schema: Any, content: Any, status_code: int = 200, **kwargs):
+        self.schema = schema
+        super().__init__(content, status_code=status_code, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        adapter = response_adapter(self.schema)
+        return adapter.dump_json(adapter.validate_python(content, from_attributes=True))
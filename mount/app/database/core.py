@@ -1,14 +1,136 @@
+import time
 from datetime import datetime, timezone
-from sqlalchemy import TIMESTAMP, text
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy import TIMESTAMP, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import get_settings
+from app.core.metrics import record_query
+from app.database.profiler import profile_query
+from app.database.routing import RoutingSession
 
-def get_db_engine():
-    return create_async_engine(get_settings().db_url)
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool which also records how long checkouts wait for a
+    free connection, so pool sizing can be based on real numbers.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            self.checkouts += 1
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+
+def get_db_engine(db_url: str | None = None):
+    """Engine for `db_url`, the primary database by default"""
+    settings = get_settings()
+    db_url = db_url or settings.db_url
+
+    connect_args = {}
+    if make_url(db_url).get_driver_name() == "asyncpg":
+        connect_args["prepared_statement_cache_size"] = settings.db_prepared_statement_cache_size
+
+    engine = create_async_engine(
+        db_url,
+        poolclass=TimedAsyncQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_use_lifo=settings.db_pool_use_lifo,
+        query_cache_size=settings.db_query_cache_size,
+        connect_args=connect_args,
+    )
+    instrument_engine(engine)
+    return engine
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Count SQL statements and their execution time against the current request,
+    and run them through the query profiler
+    """
+    profiler_enabled = get_settings().query_profiler_enabled
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        record_query(elapsed)
+        if profiler_enabled:
+            profile_query(conn, statement, parameters, executemany, elapsed)
+
+
+def get_replica_engines() -> list[AsyncEngine]:
+    """One engine per configured read replica, each with its own pool"""
+    return [get_db_engine(db_url) for db_url in get_settings().db_replica_urls]
+
+
+def get_session_factory(
+    engine: AsyncEngine, replicas: list[AsyncEngine] | None = None
+) -> async_sessionmaker[AsyncSession]:
+    """
+    Session factory shared by the whole app.
+
+    Sessions only check out a connection when their first statement runs, and
+    keep loaded attributes after commit so objects can be returned without
+    another round trip. With `replicas`, reads are routed to them as
+    described in `RoutingSession`.
+    """
+    return async_sessionmaker(
+        engine,
+        expire_on_commit=False,
+        sync_session_class=RoutingSession,
+        replicas=[replica.sync_engine for replica in replicas or []],
+    )
+
+
+def get_pool_stats(engine: AsyncEngine) -> dict:
+    """Live statistics of the engine connection pool"""
+    pool = engine.pool
+    stats = {
+        "pool_size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+    if isinstance(pool, TimedAsyncQueuePool):
+        stats.update(
+            checkouts=pool.checkouts,
+            avg_wait_ms=(
+                pool.total_wait_seconds / pool.checkouts * 1000 if pool.checkouts else 0.0
+            ),
+            max_wait_ms=pool.max_wait_seconds * 1000,
+        )
+    return stats
+
+
+def utcnow() -> datetime:
+    """Current time as naive UTC, like the values of the TIMESTAMP columns"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
 
 
 class Base(DeclarativeBase):
+    # Fetch server generated columns with RETURNING on INSERT/UPDATE
+    __mapper_args__ = {"eager_defaults": True}
+
     id: Mapped[int] = mapped_column(primary_key=True)
 
     created_at: Mapped[datetime] = mapped_column(
@@ -1 +1,3 @@
-from .user import User
\ No newline at end of file
+from .user import User
+from .refresh_token import RefreshToken
+from .job import Job, JobStatus
\ No newline at end of file
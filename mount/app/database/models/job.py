@@ -0,0 +1,40 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any
+from sqlalchemy import JSON, TIMESTAMP, ForeignKey, Index, Integer, String, Text
+from app.database.core import Base
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class Job(Base):
+    """
+    A unit of background work, run by the worker process (`app.jobs.worker`).
+
+    Queued jobs become due at `run_at`. Failed attempts are retried with a
+    growing delay until `max_attempts` is reached. Jobs queued through the
+    API record the user in `created_by`, the only one allowed to read them.
+    """
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_status_run_at", "status", "run_at"),
+    )
+
+    name: Mapped[str] = mapped_column(String)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSON, default=dict)
+    status: Mapped[str] = mapped_column(String(16), default=JobStatus.QUEUED.value)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer)
+    run_at: Mapped[datetime] = mapped_column(TIMESTAMP)
+    locked_at: Mapped[datetime | None] = mapped_column(TIMESTAMP, nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    result: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    created_by: Mapped[int | None] = mapped_column(
+        ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+    )
@@ -0,0 +1,20 @@
+from datetime import datetime
+from sqlalchemy import TIMESTAMP, ForeignKey, String
+from app.database.core import Base
+from sqlalchemy.orm import Mapped, mapped_column
+
+class RefreshToken(Base):
+    """
+    A long lived token which can be exchanged once for a new access token
+    and a new refresh token. Only the SHA-256 digest of the token is stored.
+
+    Tokens rotated out of the same login share a `family_id`, so reuse of an
+    already rotated token can revoke the whole chain.
+    """
+    __tablename__ = "refresh_tokens"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    token_hash: Mapped[str] = mapped_column(String(64), unique=True)
+    family_id: Mapped[str] = mapped_column(String(32), index=True)
+    expires_at: Mapped[datetime] = mapped_column(TIMESTAMP)
+    revoked_at: Mapped[datetime | None] = mapped_column(TIMESTAMP, nullable=True)
@@ -1,11 +1,8 @@
-import bcrypt
-
-from datetime import datetime, timedelta, timezone
 from sqlalchemy import String
-from app.core.config import get_settings
+from app.core.hashing import check_password, hash_password, password_hasher
+from app.core.tokens import ExpiredTokenError, TokenError, create_access_token, token_manager
 from app.database.core import Base
 from sqlalchemy.orm import Mapped, mapped_column
-from jose import jwt, ExpiredSignatureError, JWTError
 
 class User(Base):
     __tablename__ = "users"
@@ -16,21 +13,13 @@ class User(Base):
 
     @property
     def token(self):
-        expire = datetime.now(timezone.utc) + timedelta(minutes=get_settings().jwt_expiration_minutes)
-        to_encode = {
-            "sub": str(self.id),
-            "exp": expire
-        }
-        encoded_jwt = jwt.encode(to_encode, get_settings().jwt_secret_key)
-        return encoded_jwt
+        return create_access_token(self)
 
     def set_password(self, password: str) -> None:
-        pw = password.encode()
-        salt = bcrypt.gensalt()
-        self.password_hash = bcrypt.hashpw(pw, salt).decode()
+        self.password_hash = hash_password(password, password_hasher.rounds)
 
     def verify_password(self, password: str) -> bool:
-        return bcrypt.checkpw(password.encode(), self.password_hash.encode())
+        return check_password(password, self.password_hash)
     
     @staticmethod
     def verify_token(token: str) -> dict | None:
@@ -38,14 +27,14 @@ class User(Base):
         Verifies the JWT token and returns the decoded payload if valid.
 
         Raises:
-            ExpiredSignatureError: if the token has expired.
-            JWTError: if the token is invalid.
+            ExpiredTokenError: if the token has expired.
+            TokenError: if the token is invalid.
         """
         try:
-            payload = jwt.decode(token, get_settings().jwt_secret_key)
+            payload = token_manager.decode(token)
             return payload
-        except ExpiredSignatureError:
+        except ExpiredTokenError:
             print("Token has expired.")
-        except JWTError:
+        except TokenError:
             print("Invalid token.")
         return None
\ No newline at end of file
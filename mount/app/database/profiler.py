@@ -0,0 +1,94 @@
+import hashlib
+import re
+from functools import lru_cache
+
+from app.core import logger
+from app.core.config import get_settings
+from app.core.metrics import current_request_stats
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|(?<![$\w])\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LISTS = re.compile(r"\((?:\s*(?:\?|%s|\$\d+|:\w+|__\[POSTCOMPILE_\w+\])\s*,?)+\)")
+_WHITESPACE = re.compile(r"\s+")
+_EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE")
+
+
+class RepeatedQueryError(Exception):
+    """Raised in tests when one request runs the same statement shape too often"""
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> tuple[str, str]:
+    """
+    Normalized shape of a SQL statement and a short digest of it. Literals
+    are replaced and IN lists collapsed, so statements differing only in
+    values share a fingerprint
+    """
+    shape = _LITERALS.sub("?", statement)
+    shape = _PLACEHOLDER_LISTS.sub("(...)", shape)
+    shape = _WHITESPACE.sub(" ", shape).strip()
+    return shape, hashlib.sha1(shape.encode()).hexdigest()[:12]
+
+
+def _explain(conn, statement: str, parameters) -> str | None:
+    """
+    Planner output for a statement, run on a separate cursor of the same
+    connection. The EXPLAIN runs inside a savepoint, so when it fails the
+    request's transaction is rolled back to where it was instead of aborted
+    """
+    if conn.dialect.name != "postgresql" or not statement.lstrip().upper().startswith(_EXPLAINABLE):
+        return None
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT query_profiler_explain")
+        try:
+            cursor.execute(f"EXPLAIN {statement}", parameters)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        except Exception:
+            cursor.execute("ROLLBACK TO SAVEPOINT query_profiler_explain")
+            raise
+        cursor.execute("RELEASE SAVEPOINT query_profiler_explain")
+        return plan
+    except Exception as exc:
+        return f"EXPLAIN failed: {exc}"
+    finally:
+        cursor.close()
+
+
+def profile_query(conn, statement: str, parameters, executemany: bool, elapsed: float) -> None:
+    """
+    Log statements slower than `slow_query_threshold_ms` with their plan, and
+    flag statement shapes repeated `repeated_query_threshold` times within one
+    request, which usually means an N+1 loop
+    """
+    settings = get_settings()
+    shape, digest = fingerprint(statement)
+
+    if elapsed * 1000 >= settings.slow_query_threshold_ms:
+        plan = None
+        if settings.slow_query_explain and not executemany:
+            plan = _explain(conn, statement, parameters)
+        logger.warning(
+            "slow query",
+            fingerprint=digest,
+            duration_ms=round(elapsed * 1000, 2),
+            statement=shape,
+            plan=plan,
+        )
+
+    stats = current_request_stats()
+    if stats is None:
+        return
+
+    count = stats.statement_counts.get(digest, 0) + 1
+    stats.statement_counts[digest] = count
+    if count == settings.repeated_query_threshold:
+        logger.warning(
+            "repeated query",
+            fingerprint=digest,
+            count=count,
+            statement=shape,
+        )
+        if settings.repeated_query_raise:
+            raise RepeatedQueryError(
+                f"Statement ran {count} times in one request: {shape}"
+            )
@@ -0,0 +1,76 @@
+import random
+from contextvars import ContextVar
+
+from sqlalchemy import Delete, Engine, Insert, Select, Update
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+
+# Who the current request acts for (the authenticated user id), so reads
+# right after their own writes can be kept on the primary
+consistency_key: ContextVar[str | None] = ContextVar("consistency_key", default=None)
+
+# Consistency keys which wrote recently, expiring after the sticky window.
+# Per worker: a user whose next request lands on another worker may read
+# from a replica before the window is over
+recent_writers: TTLCache[str, bool] = TTLCache(
+    maxsize=100_000, ttl=get_settings().db_sticky_primary_seconds
+)
+
+
+def set_consistency_key(key: str | None) -> None:
+    """Tie the queries of the current request to `key`, e.g. the user id"""
+    consistency_key.set(key)
+
+
+class RoutingSession(Session):
+    """
+    Session which sends plain SELECTs to a random replica and everything
+    else (flushes, INSERT/UPDATE/DELETE, SELECT ... FOR UPDATE, raw SQL)
+    to the primary, which is the session's own bind. Connections taken
+    directly with `connection()`, e.g. for COPY, also count as writes unless
+    a `clause` is given in `bind_arguments`. Pass `use_primary=True` in
+    `bind_arguments` to read from the primary regardless.
+
+    Reads stay on the primary for the rest of the session once it wrote,
+    and for `db_sticky_primary_seconds` after a write by the same
+    consistency key, so callers always read their own writes.
+    """
+
+    def __init__(self, *args, replicas: list[Engine] | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas or []
+
+    def get_bind(self, mapper=None, *, clause=None, use_primary=False, **kwargs):
+        primary = super().get_bind(mapper, clause=clause, **kwargs)
+        if use_primary or not self.replicas:
+            return primary
+
+        if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            self._mark_write()
+            return primary
+
+        if (
+            isinstance(clause, Select)
+            and clause._for_update_arg is None
+            and not self.info.get("wrote")
+            and not self._recently_wrote()
+        ):
+            return random.choice(self.replicas)
+        return primary
+
+    def connection(self, bind_arguments=None, **kwargs):
+        if not (bind_arguments and "clause" in bind_arguments):
+            self._mark_write()
+        return super().connection(bind_arguments, **kwargs)
+
+    def _mark_write(self) -> None:
+        self.info["wrote"] = True
+        key = consistency_key.get()
+        if key is not None:
+            recent_writers.set(key, True)
+
+    def _recently_wrote(self) -> bool:
+        key = consistency_key.get()
+        return key is not None and recent_writers.get(key) is not None
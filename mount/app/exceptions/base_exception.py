@@ -1,10 +1,11 @@
 from pydantic import BaseModel
 
 class AppBaseException(Exception):
-    def __init__(self, status_code: int, error_code: str, detail: str):
+    def __init__(self, status_code: int, error_code: str, detail: str, headers: dict[str, str] | None = None):
         self.status_code = status_code
         self.error_code = error_code
         self.detail = detail
+        self.headers = headers
 
 
 class HTTPExceptionResponseModel(BaseModel):
@@ -0,0 +1,43 @@
+from fastapi import status
+
+from app.exceptions.base_exception import AppBaseException
+
+
+class UnknownJobException(AppBaseException):
+
+    def __init__(self, name: str) -> None:
+        super().__init__(
+            status_code=status.HTTP_404_NOT_FOUND,
+            error_code="UNKNOWN_JOB",
+            detail=f"No job named {name}"
+        )
+
+
+class JobNotFoundException(AppBaseException):
+
+    def __init__(self, id: int) -> None:
+        super().__init__(
+            status_code=status.HTTP_404_NOT_FOUND,
+            error_code="JOB_NOT_FOUND",
+            detail=f"Job {id} not found"
+        )
+
+
+class InvalidJobPayloadException(AppBaseException):
+
+    def __init__(self, name: str, errors: str) -> None:
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            error_code="INVALID_JOB_PAYLOAD",
+            detail=f"Invalid payload for job {name}: {errors}"
+        )
+
+
+class JobResultUnavailableException(AppBaseException):
+
+    def __init__(self, id: int) -> None:
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            error_code="JOB_RESULT_UNAVAILABLE",
+            detail=f"Job {id} has no file to download, it hasn't succeeded yet or its file expired"
+        )
@@ -0,0 +1,33 @@
+from fastapi import status
+
+from app.exceptions.base_exception import AppBaseException
+
+
+class InvalidQueryException(AppBaseException):
+
+    def __init__(self, detail: str) -> None:
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            error_code="INVALID_QUERY",
+            detail=detail
+        )
+
+
+class InvalidCursorException(AppBaseException):
+
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            error_code="INVALID_CURSOR",
+            detail="Pagination cursor is invalid or does not match the requested ordering"
+        )
+
+
+class RecordConflictException(AppBaseException):
+
+    def __init__(self, detail: str) -> None:
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            error_code="RECORD_CONFLICT",
+            detail=detail
+        )
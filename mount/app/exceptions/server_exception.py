@@ -0,0 +1,24 @@
+from fastapi import status
+
+from app.exceptions.base_exception import AppBaseException
+
+
+class ServiceBusyException(AppBaseException):
+
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            error_code="SERVICE_BUSY",
+            detail="Server is busy, please retry shortly"
+        )
+
+
+class TooManyRequestsException(AppBaseException):
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            error_code="TOO_MANY_REQUESTS",
+            detail=f"Too many attempts, retry in {retry_after} seconds",
+            headers={"Retry-After": str(retry_after)}
+        )
@@ -19,4 +19,13 @@ class InvalidUsernamePasswordException(AppBaseException):
             status_code=status.HTTP_400_BAD_REQUEST,
             error_code="INVALID_USER_CREDS",
             detail="Invalid username or password"
-        )
\ No newline at end of file
+        )
+
+class InvalidRefreshTokenException(AppBaseException):
+
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            error_code="INVALID_REFRESH_TOKEN",
+            detail="Refresh token is invalid, expired or revoked"
+        )
@@ -0,0 +1,2 @@
+from app.jobs.registry import JOB_HANDLERS, enqueue, job, schedule_periodic
+from app.jobs import tasks
@@ -0,0 +1,135 @@
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Awaitable, Callable
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.database.core import utcnow
+from app.database.models.job import Job
+from app.exceptions.job_exception import InvalidJobPayloadException, UnknownJobException
+from app.repositories.job_repository import job_repo
+
+JobFunc = Callable[[AsyncSession, dict[str, Any]], Awaitable[dict[str, Any] | None]]
+
+
+@dataclass(frozen=True)
+class JobHandler:
+    name: str
+    func: JobFunc
+    max_attempts: int
+    # Jobs of this name running at once per worker, None for no limit
+    concurrency: int | None
+    # Whether users may queue it through the API
+    public: bool
+    # Seconds between runs of a periodic job, None for jobs only run when queued
+    every: float | None
+    # Model validating the payload when the job is queued
+    schema: type[BaseModel] | None
+
+
+JOB_HANDLERS: dict[str, JobHandler] = {}
+
+
+def job(
+    name: str,
+    *,
+    max_attempts: int | None = None,
+    concurrency: int | None = None,
+    public: bool = False,
+    every: float | None = None,
+    schema: type[BaseModel] | None = None,
+):
+    """
+    Register an async function as the handler of jobs called `name`.
+
+    The handler gets its own database session and the job payload, and may
+    return a JSON serializable dict stored as the job result. Raising fails
+    the attempt; it is retried with backoff until `max_attempts`, so
+    handlers must be safe to run more than once.
+
+    Only `public` jobs can be queued through the API, with a payload chosen
+    by the user, so handlers marked public should give a `schema` to
+    validate it when queued.
+
+    Jobs with `every` are periodic: workers queue one on startup and the
+    next one `every` seconds after each run, unless one is already queued.
+    """
+
+    def decorator(func: JobFunc) -> JobFunc:
+        JOB_HANDLERS[name] = JobHandler(
+            name=name,
+            func=func,
+            max_attempts=max_attempts or get_settings().job_max_attempts,
+            concurrency=concurrency,
+            public=public,
+            every=every,
+            schema=schema,
+        )
+        return func
+
+    return decorator
+
+
+async def enqueue(
+    db: AsyncSession,
+    name: str,
+    payload: dict[str, Any] | None = None,
+    *,
+    delay_seconds: float = 0,
+    created_by: int | None = None,
+    public_only: bool = False,
+) -> Job:
+    """Queue a job for the worker, due after `delay_seconds`
+
+    Args:
+        db (AsyncSession): Asynchronous Sqlalchemy database session object
+        name (str): name of a registered job
+        payload (dict, optional): JSON serializable arguments of the job
+        delay_seconds (float): seconds before the job is due
+        created_by (int, optional): id of the user queuing the job
+        public_only (bool): only accept jobs registered as public, for
+            jobs queued on behalf of users
+
+    Raises:
+        UnknownJobException: If no job (or no public job) is registered
+            under `name`
+        InvalidJobPayloadException: If the payload doesn't match the
+            job's schema
+
+    Returns:
+        Job: the queued job
+    """
+    handler = JOB_HANDLERS.get(name)
+    if handler is None or (public_only and not handler.public):
+        raise UnknownJobException(name)
+
+    payload = payload or {}
+    if handler.schema is not None:
+        try:
+            payload = handler.schema.model_validate(payload).model_dump(mode="json")
+        except ValidationError as exc:
+            raise InvalidJobPayloadException(name, "; ".join(
+                f"{'.'.join(map(str, error['loc'])) or 'payload'}: {error['msg']}" for error in exc.errors()
+            ))
+
+    return await job_repo.enqueue(
+        db,
+        name=name,
+        payload=payload,
+        max_attempts=handler.max_attempts,
+        run_at=utcnow() + timedelta(seconds=delay_seconds),
+        created_by=created_by,
+    )
+
+
+async def schedule_periodic(db: AsyncSession, handler: JobHandler, *, delay_seconds: float) -> Job | None:
+    """
+    Queue the next run of a periodic job, unless one is already queued or
+    running. Workers starting together may both queue one, the extra run
+    ends the duplicate schedule since the next one is then found queued
+    """
+    if await job_repo.has_pending(db, handler.name):
+        return None
+    return await enqueue(db, handler.name, delay_seconds=delay_seconds)
@@ -0,0 +1,36 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.exports import purge_export_files, write_export
+from app.jobs.registry import job
+from app.repositories.refresh_token_repository import refresh_token_repo
+from app.repositories.user_repository import user_repo
+from app.schemas.filter_schema import ExportParams
+from app.schemas.user_schema import UserPublic
+
+
+@job("purge_expired_refresh_tokens", concurrency=1, every=get_settings().job_purge_interval_seconds)
+async def purge_expired_refresh_tokens(db: AsyncSession, payload: dict) -> dict:
+    """Delete refresh tokens past their expiry"""
+    return {"deleted": await refresh_token_repo.purge_expired(db)}
+
+
+@job("purge_expired_exports", concurrency=1, every=get_settings().job_purge_interval_seconds)
+async def purge_expired_exports(db: AsyncSession, payload: dict) -> dict:
+    """Delete export files older than `export_file_ttl_seconds`"""
+    return {"deleted": purge_export_files(get_settings().export_file_ttl_seconds)}
+
+
+@job("export_users", concurrency=1, public=True, schema=ExportParams)
+async def export_users(db: AsyncSession, payload: dict) -> dict:
+    """
+    Write users matching the payload's export query to a file, downloaded
+    from `/jobs/{id}/file` once done
+    """
+    return await write_export(
+        db,
+        user_repo,
+        ExportParams.model_validate(payload),
+        default_fields=user_repo.schema_fields(UserPublic),
+        filename="users",
+    )
@@ -0,0 +1,217 @@
+"""
+Background job worker. Run it next to the API:
+
+    python -m app.jobs.worker
+
+Any number of workers can run against the same database, claims never
+overlap.
+"""
+import asyncio
+import random
+import signal
+import time
+from collections import Counter
+from datetime import timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core import logger
+from app.core.config import get_settings
+from app.core.hashing import password_hasher
+from app.database.core import get_db_engine, get_session_factory, utcnow
+from app.database.models.job import Job
+from app.exceptions.base_exception import AppBaseException
+from app.jobs import JOB_HANDLERS, schedule_periodic
+from app.jobs.registry import JobHandler
+from app.repositories.job_repository import job_repo
+
+
+def retry_delay(attempts: int, *, base: float, maximum: float) -> float:
+    """Exponential backoff with jitter: about base * 2^(attempts - 1), capped at maximum"""
+    delay = min(maximum, base * 2 ** (attempts - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class Worker:
+    """
+    Polls the job table and runs due jobs, at most `concurrency` at once,
+    and at most the handler's own `concurrency` for each job name.
+
+    Queues periodic jobs on startup, and their next run after each one.
+    Stops claiming on `stop()` and waits for the running jobs to finish.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        concurrency: int = 4,
+        poll_interval: float = 1.0,
+        retry_base: float = 5.0,
+        retry_max: float = 900.0,
+        lock_timeout: float = 600.0,
+    ):
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.lock_timeout = lock_timeout
+
+        self._running: dict[asyncio.Task, str] = {}
+        self._name_slots: dict[str, asyncio.Semaphore] = {}
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._last_recovery = 0.0
+
+    def stop(self) -> None:
+        self._stopping = True
+        self._wakeup.set()
+
+    def _saturated_names(self) -> list[str]:
+        running = Counter(self._running.values())
+        return [
+            name for name, count in running.items()
+            if (handler := JOB_HANDLERS.get(name)) and handler.concurrency is not None
+            and count >= handler.concurrency
+        ]
+
+    def _name_slot(self, name: str, concurrency: int) -> asyncio.Semaphore:
+        # Names at their limit aren't claimed, but one claim can still take
+        # several jobs of a name, the extra ones wait here
+        if name not in self._name_slots:
+            self._name_slots[name] = asyncio.Semaphore(concurrency)
+        return self._name_slots[name]
+
+    async def run(self) -> None:
+        logger.info("Job worker started", concurrency=self.concurrency, jobs=sorted(JOB_HANDLERS))
+        for handler in JOB_HANDLERS.values():
+            if handler.every is not None:
+                await self._schedule(handler, delay_seconds=0)
+
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                await self._recover_stale()
+                claimed = await self._claim()
+            except Exception as exc:
+                logger.exception("Claiming jobs failed", exc)
+                claimed = 0
+
+            # Claim again right away while the queue keeps slots busy
+            if claimed == 0 or len(self._running) >= self.concurrency:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+        logger.info("Job worker stopped")
+
+    async def _schedule(self, handler: JobHandler, *, delay_seconds: float) -> None:
+        try:
+            async with self.session_factory() as db:
+                await schedule_periodic(db, handler, delay_seconds=delay_seconds)
+        except Exception as exc:
+            logger.exception("Scheduling periodic job failed", exc, job=handler.name)
+
+    async def _recover_stale(self) -> None:
+        if time.monotonic() - self._last_recovery < self.lock_timeout / 4:
+            return
+        self._last_recovery = time.monotonic()
+        async with self.session_factory() as db:
+            recovered = await job_repo.requeue_stale(
+                db, locked_before=utcnow() - timedelta(seconds=self.lock_timeout)
+            )
+        if recovered:
+            logger.warning("Recovered stale jobs", count=recovered)
+
+    async def _claim(self) -> int:
+        free = self.concurrency - len(self._running)
+        if free <= 0:
+            return 0
+
+        async with self.session_factory() as db:
+            jobs = await job_repo.claim(db, limit=free, exclude_names=self._saturated_names())
+
+        for job in jobs:
+            task = asyncio.create_task(self._execute(job))
+            self._running[task] = job.name
+            task.add_done_callback(self._on_done)
+        return len(jobs)
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        self._running.pop(task, None)
+        self._wakeup.set()
+
+    async def _execute(self, job: Job) -> None:
+        handler = JOB_HANDLERS.get(job.name)
+        started = time.perf_counter()
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for job {job.name}")
+            if handler.concurrency is None:
+                async with self.session_factory() as db:
+                    result = await handler.func(db, job.payload)
+            else:
+                async with self._name_slot(job.name, handler.concurrency):
+                    async with self.session_factory() as db:
+                        result = await handler.func(db, job.payload)
+        except Exception as exc:
+            # Client errors, such as an invalid export query, fail the same
+            # way on every attempt
+            invalid = isinstance(exc, AppBaseException) and exc.status_code < 500
+            retry_at = None
+            if handler is not None and not invalid and job.attempts < job.max_attempts:
+                retry_at = utcnow() + timedelta(
+                    seconds=retry_delay(job.attempts, base=self.retry_base, maximum=self.retry_max)
+                )
+            logger.exception(
+                "Job failed", exc, job_id=job.id, job=job.name, attempt=job.attempts, retry_at=retry_at
+            )
+            error = f"{exc.error_code}: {exc.detail}" if invalid else repr(exc)
+            async with self.session_factory() as db:
+                await job_repo.mark_failed(db, id=job.id, error=error, retry_at=retry_at)
+            if retry_at is None and handler is not None and handler.every is not None:
+                await self._schedule(handler, delay_seconds=handler.every)
+            return
+
+        async with self.session_factory() as db:
+            await job_repo.mark_succeeded(db, id=job.id, result=result)
+        logger.info(
+            "Job succeeded",
+            job_id=job.id,
+            job=job.name,
+            attempt=job.attempts,
+            duration_ms=round((time.perf_counter() - started) * 1000, 3),
+        )
+        if handler.every is not None:
+            await self._schedule(handler, delay_seconds=handler.every)
+
+
+async def main() -> None:
+    settings = get_settings()
+    engine = get_db_engine()
+    worker = Worker(
+        get_session_factory(engine),
+        concurrency=settings.job_worker_concurrency,
+        poll_interval=settings.job_poll_interval_seconds,
+        retry_base=settings.job_retry_base_seconds,
+        retry_max=settings.job_retry_max_seconds,
+        lock_timeout=settings.job_lock_timeout_seconds,
+    )
+
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        await engine.dispose()
+        password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
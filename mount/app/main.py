@@ -1,9 +1,14 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, status
+from fastapi.responses import PlainTextResponse
 
 from app.api.dependencies import CurrentUserDep
-from app.database.core import get_db_engine
+from app.database.core import get_db_engine, get_replica_engines, get_session_factory
+from app.core import logger, metrics
+from app.core.config import get_settings
+from app.core.hashing import password_hasher
 from app.core.middlewares import init_middlewares, init_exception_middlewares
+from app.core.responses import AppJSONResponse
 from app.api import api_router
 from app.schemas.base_schema import ErrorResponseModel
 
@@ -14,11 +19,26 @@ A FastAPI-powered backend for managing school financial operations, including bu
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     app.state.db_pool = get_db_engine()
+    app.state.db_replicas = get_replica_engines()
+    app.state.db_session_factory = get_session_factory(app.state.db_pool, app.state.db_replicas)
+    if get_settings().password_hash_calibrate:
+        rounds = await password_hasher.calibrate(
+            target_ms=get_settings().password_hash_target_ms,
+            min_rounds=get_settings().password_hash_min_rounds,
+            max_rounds=get_settings().password_hash_max_rounds,
+        )
+        logger.info("Calibrated bcrypt cost", rounds=rounds)
     yield
     await app.state.db_pool.dispose()
+    for replica in app.state.db_replicas:
+        await replica.dispose()
+    password_hasher.shutdown()
 
 app = FastAPI(
-    title="School Management System API 🎟️", description=app_description, lifespan=lifespan
+    title="School Management System API 🎟️",
+    description=app_description,
+    lifespan=lifespan,
+    default_response_class=AppJSONResponse,
 )
 
 default_responses: dict = {
@@ -45,3 +65,12 @@ async def health_check():
     Checks System health
     """
     return {"health": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False, response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Request latency, DB time and query count histograms in the Prometheus
+    text format
+    """
+    return metrics.render()
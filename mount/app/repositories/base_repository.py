@@ -1,16 +1,81 @@
-from typing import Any, Generic, Type, TypeVar, cast
+import asyncio
+from functools import cache
+from typing import Any, AsyncIterator, Awaitable, Callable, Generic, Literal, Type, TypeVar, cast
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, func, and_, insert
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy import RowMapping, Select, inspect, select, delete, func, and_, insert, tuple_, update
 
+from app.core.cache import TTLCache
+from app.core.config import get_settings
 from app.database.core import Base
+from app.exceptions.query_exception import InvalidQueryException, RecordConflictException
+from app.repositories.filtering import build_filter_statement, split_conditions
+from app.repositories.counting import TotalCount, estimate_query_rows, estimate_table_rows
+from app.repositories.pagination import decode_cursor, encode_cursor
+from app.schemas.filter_schema import FilterCondition, FilterOperator
+from app.schemas.pagination_schema import CountStrategy
 
 # Type variables for generic typing
 ModelType = TypeVar("ModelType", bound=Base)
 
+# Inserts `get_or_create` tries before giving up on a record which keeps
+# conflicting without being found
+GET_OR_CREATE_ATTEMPTS = 3
+
+
+# Column values of records loaded through `BaseRepository.get`, keyed by
+# (model, id), for repositories which set `identity_cache_ttl`
+identity_cache: TTLCache[tuple[type, Any], dict[str, Any]] = TTLCache(
+    maxsize=get_settings().identity_cache_size, ttl=60
+)
+
+# Loads in flight per (model, id), so concurrent misses share one query
+_identity_loads: dict[tuple[type, Any], asyncio.Future] = {}
+
+# Result of a failed load, callers waiting on it query for themselves
+_LOAD_FAILED = object()
+
+# Repositories using the identity cache, for reporting
+_identity_cached_repositories: list["BaseRepository"] = []
+
+
+def identity_cache_stats() -> dict[str, dict]:
+    """Identity cache hit and miss counters per table"""
+    return {
+        repository.model.__tablename__: {
+            "hits": repository.identity_hits,
+            "misses": repository.identity_misses,
+        }
+        for repository in _identity_cached_repositories
+    }
+
+
+@cache
+def model_fields(model: Type[Base]) -> frozenset[str]:
+    """Names of the mapped column attributes of a model, computed once per model"""
+    return frozenset(inspect(model).column_attrs.keys())
+
+
+@cache
+def schema_fields(model: Type[Base], schema: Type[BaseModel]) -> list[str]:
+    """Model columns a response schema reads, in schema field order"""
+    fields = model_fields(model)
+    return [field for field in schema.model_fields if field in fields]
+
 
 class BaseRepository(Generic[ModelType]):
+    # Columns which can never be filtered, sorted or selected by API clients,
+    # i.e. through `filter_by`, `stream` and `get_page`. Methods taking
+    # filters from application code (`update_where`, `delete_where`,
+    # `count_total`, `get_or_create`) may still use them
+    private_fields: frozenset[str] = frozenset()
+    # Seconds `get` serves a record from the identity cache, None disables it.
+    # Only for records changed exclusively through the repository's methods
+    identity_cache_ttl: float | None = None
+
     def __init__(self, model: Type[ModelType]):
         """
         Async CRUD object with default methods to Create, Read, Update, Delete (CRUD).
@@ -19,14 +84,154 @@ class BaseRepository(Generic[ModelType]):
         * `model`: A SQLAlchemy model class
         """
         self.model = model
+        self._write_listeners: list[Callable[[Any], None]] = []
+        self._change_listeners: list[Callable[[], None]] = []
+        self._count_cache: TTLCache[tuple, int] = TTLCache(
+            maxsize=256, ttl=get_settings().count_cache_ttl_seconds
+        )
+        self.identity_hits = 0
+        self.identity_misses = 0
+        # Bumped on every write, a load overlapping a write isn't cached
+        self._identity_writes = 0
+        if self.identity_cache_ttl is not None:
+            _identity_cached_repositories.append(self)
+
+    @property
+    def queryable_fields(self) -> frozenset[str]:
+        return model_fields(self.model) - self.private_fields
+
+    def schema_fields(self, schema: Type[BaseModel]) -> list[str]:
+        """Columns needed to build `schema`, for selecting rows instead of models"""
+        return schema_fields(self.model, schema)
+
+    def _columns(self, fields: list[str]) -> list:
+        allowed_fields = self.queryable_fields
+        for field in fields:
+            if field not in allowed_fields:
+                raise InvalidQueryException(f"Cannot select '{field}'")
+        return [getattr(self.model, field) for field in dict.fromkeys(fields)]
+
+    def add_write_listener(self, listener: Callable[[Any], None]) -> None:
+        """
+        Register a callback which receives the ID of every record changed or
+        removed through this repository, e.g. to invalidate caches
+        """
+        self._write_listeners.append(listener)
+
+    def add_change_listener(self, listener: Callable[[], Awaitable[None]]) -> None:
+        """
+        Register an async callback awaited once after every write through
+        this repository, creates included, e.g. to drop cached query results.
+        Writes return only after it completes
+        """
+        self._change_listeners.append(listener)
+
+    async def _notify_write(self, *ids: Any) -> None:
+        if self.identity_cache_ttl is not None:
+            self._identity_writes += 1
+            if ids:
+                for id in ids:
+                    identity_cache.pop((self.model, id))
+            else:
+                identity_cache.evict(lambda key: key[0] is self.model)
+        for listener in self._write_listeners:
+            for id in ids:
+                listener(id)
+        for change_listener in self._change_listeners:
+            await change_listener()
+
+    @staticmethod
+    def _to_dict(obj_in: BaseModel | dict) -> dict[str, Any]:
+        if isinstance(obj_in, BaseModel):
+            return obj_in.model_dump()
+        return dict(obj_in)
+
+    def _writable_values(self, obj_in: BaseModel | dict[str, Any]) -> dict[str, Any]:
+        fields = model_fields(self.model)
+        return {key: value for key, value in self._to_dict(obj_in).items() if key in fields}
+
+    def _insert_statement(self, db: AsyncSession):
+        """INSERT supporting ON CONFLICT for the dialect of the session"""
+        if db.get_bind().dialect.name == "sqlite":
+            return sqlite.insert(self.model)
+        return postgresql.insert(self.model)
+
+    def _equality_conditions(
+        self, filters: dict[str, Any] | None, allowed_fields: frozenset[str] | None = None
+    ) -> list:
+        """
+        Equality conditions on `allowed_fields`, every column by default. That
+        default is for filters written by application code, where private
+        columns are fair game, e.g. updating a password only while its hash
+        is unchanged. Pass `queryable_fields` for filters from clients
+        """
+        fields = model_fields(self.model) if allowed_fields is None else allowed_fields
+        conditions = []
+        for attr, value in (filters or {}).items():
+            if attr not in fields:
+                raise InvalidQueryException(f"Cannot filter by '{attr}'")
+            conditions.append(getattr(self.model, attr) == value)
+        return conditions
+
+    def _cache_identity(self, db_obj: ModelType) -> dict[str, Any] | None:
+        """Store the column values of `db_obj` in the identity cache, returns them"""
+        if self.identity_cache_ttl is None:
+            return None
+        values = {field: getattr(db_obj, field) for field in model_fields(self.model)}
+        identity_cache.set((self.model, db_obj.id), values, ttl=self.identity_cache_ttl)
+        return values
+
+    async def _attach_cached(self, db: AsyncSession, values: dict[str, Any]) -> ModelType:
+        """Persistent instance in `db` built from cached column values, without a query"""
+        db_obj = self.model(**values)
+        make_transient_to_detached(db_obj)
+        return await db.merge(db_obj, load=False)
 
     async def get(self, db: AsyncSession, id: Any) -> ModelType | None:
         """
         Get a single record by ID
-        """
-        stmt = select(self.model).where(self.model.id == id)
-        result = await db.execute(stmt)
-        return result.scalar_one_or_none()
+        With `identity_cache_ttl` set, records are served from the identity
+        cache when possible, and concurrent misses for the same ID share a
+        single query. Misses read from the primary: a row from a lagging
+        replica would be cached for the whole TTL
+        """
+        if self.identity_cache_ttl is None:
+            stmt = select(self.model).where(self.model.id == id)
+            result = await db.execute(stmt)
+            return result.scalar_one_or_none()
+
+        key = (self.model, id)
+        values = identity_cache.get(key)
+        if values is not None:
+            self.identity_hits += 1
+            return await self._attach_cached(db, values)
+        self.identity_misses += 1
+
+        loading = _identity_loads.get(key)
+        if loading is not None:
+            values = await asyncio.shield(loading)
+            if values is None:
+                return None
+            if values is not _LOAD_FAILED:
+                return await self._attach_cached(db, values)
+
+        future = asyncio.get_running_loop().create_future()
+        _identity_loads[key] = future
+        writes = self._identity_writes
+        values = _LOAD_FAILED
+        try:
+            stmt = select(self.model).where(self.model.id == id)
+            result = await db.execute(stmt, bind_arguments={"use_primary": True})
+            db_obj = result.scalar_one_or_none()
+            if db_obj is None:
+                values = None
+            elif writes == self._identity_writes:
+                values = self._cache_identity(db_obj)
+            return db_obj
+        finally:
+            future.set_result(values)
+            if _identity_loads.get(key) is future:
+                del _identity_loads[key]
 
     async def get_multi(
         self, db: AsyncSession, *, skip: int = 0, limit: int = 100
@@ -38,6 +243,73 @@ class BaseRepository(Generic[ModelType]):
         result = await db.execute(stmt)
         return cast(list[ModelType], result.scalars().all())
 
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        cursor: str | None = None,
+        limit: int = 10,
+        order_by: str = "id",
+        descending: bool = False,
+        filters: dict[str, Any] | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[list[ModelType] | list[dict[str, Any]], str | None]:
+        """
+        Get a page of records with keyset (cursor) pagination
+
+        Seeks past the last row of the previous page on `(order_by, id)`
+        instead of using OFFSET, so deep pages cost the same as the first one.
+        The ordering column should be non-nullable and indexed together with `id`.
+        With `fields` only those columns (plus `id` and `order_by`) are selected
+        and returned as plain dicts, skipping ORM hydration
+        Returns tuple of (records, next_cursor), next_cursor is None on the last page
+        """
+        if order_by not in self.queryable_fields:
+            raise InvalidQueryException(f"Cannot order by '{order_by}'")
+
+        sort_key = f"-{order_by}" if descending else order_by
+        order_column = getattr(self.model, order_by)
+        if fields:
+            stmt = select(*self._columns([*fields, "id", order_by]))
+        else:
+            stmt = select(self.model)
+        stmt = stmt.where(*self._equality_conditions(filters, self.queryable_fields))
+
+        if cursor:
+            value, last_id = decode_cursor(
+                cursor, order_by=sort_key, column=inspect(self.model).columns[order_by]
+            )
+            if order_by == "id":
+                key, bound = self.model.id, last_id
+            else:
+                key, bound = tuple_(order_column, self.model.id), tuple_(value, last_id)
+            stmt = stmt.where(key < bound if descending else key > bound)
+
+        if order_by == "id":
+            ordering = [order_column.desc() if descending else order_column.asc()]
+        elif descending:
+            ordering = [order_column.desc(), self.model.id.desc()]
+        else:
+            ordering = [order_column.asc(), self.model.id.asc()]
+
+        # One extra row tells whether there is a next page
+        stmt = stmt.order_by(*ordering).limit(limit + 1)
+        result = await db.execute(stmt)
+        if fields:
+            records = [dict(row) for row in result.mappings()]
+        else:
+            records = list(result.scalars().all())
+
+        next_cursor = None
+        if len(records) > limit:
+            records = records[:limit]
+            last = records[-1]
+            if fields:
+                next_cursor = encode_cursor(sort_key, last[order_by], last["id"])
+            else:
+                next_cursor = encode_cursor(sort_key, getattr(last, order_by), last.id)
+        return records, next_cursor
+
     async def get_by_attribute(
         self, db: AsyncSession, *, attribute: str, value: Any
     ) -> ModelType | None:
@@ -71,7 +343,8 @@ class BaseRepository(Generic[ModelType]):
         db_obj = self.model(**obj_in_data)
         db.add(db_obj)
         await db.commit()
-        await db.refresh(db_obj)
+        await self._notify_write(db_obj.id)
+        self._cache_identity(db_obj)
         return db_obj
 
     async def create_multi(self, db: AsyncSession, *, objs_in: list[BaseModel | dict]) -> list[ModelType]:
@@ -86,8 +359,7 @@ class BaseRepository(Generic[ModelType]):
             db.add(db_obj)
         
         await db.commit()
-        for db_obj in db_objs:
-            await db.refresh(db_obj)
+        await self._notify_write(*(db_obj.id for db_obj in db_objs))
         return db_objs
 
     async def update(
@@ -100,16 +372,12 @@ class BaseRepository(Generic[ModelType]):
         """
         Update an existing record
         """
-        obj_data = jsonable_encoder(db_obj)
-        update_data = jsonable_encoder(obj_in)
-        
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-        
+        for field, value in self._writable_values(obj_in).items():
+            setattr(db_obj, field, value)
+
         db.add(db_obj)
         await db.commit()
-        await db.refresh(db_obj)
+        await self._notify_write(db_obj.id)
         return db_obj
 
     async def update_by_id(
@@ -122,21 +390,59 @@ class BaseRepository(Generic[ModelType]):
         """
         Update a record by ID
         """
-        db_obj = await self.get(db=db, id=id)
-        if db_obj:
-            return await self.update(db=db, db_obj=db_obj, obj_in=obj_in)
-        return None
+        db_objs = await self.update_where(db, filters={"id": id}, obj_in=obj_in)
+        return db_objs[0] if db_objs else None
+
+    async def update_where(
+        self,
+        db: AsyncSession,
+        *,
+        filters: dict[str, Any],
+        obj_in: BaseModel | dict[str, Any]
+    ) -> list[ModelType]:
+        """
+        Update every record matching `filters` with a single
+        `UPDATE ... RETURNING` statement. Fields which are not columns of the
+        model are ignored
+        Returns the updated records
+        """
+        if not filters:
+            raise ValueError("update_where requires at least one filter")
+
+        stmt = (
+            update(self.model)
+            .where(*self._equality_conditions(filters))
+            .values(**self._writable_values(obj_in))
+            .returning(self.model)
+        )
+        result = await db.scalars(stmt, execution_options={"populate_existing": True})
+        db_objs = cast(list[ModelType], list(result.all()))
+        await db.commit()
+        await self._notify_write(*(db_obj.id for db_obj in db_objs))
+        return db_objs
 
     async def delete(self, db: AsyncSession, *, id: Any) -> ModelType | None:
         """
         Delete a record by ID
         """
-        db_obj = await self.get(db=db, id=id)
-        if db_obj:
-            await db.delete(db_obj)
-            await db.commit()
-            return db_obj
-        return None
+        db_objs = await self.delete_where(db, filters={"id": id})
+        return db_objs[0] if db_objs else None
+
+    async def delete_where(self, db: AsyncSession, *, filters: dict[str, Any]) -> list[ModelType]:
+        """
+        Delete every record matching `filters` with a single
+        `DELETE ... RETURNING` statement
+        Returns the deleted records
+        """
+        if not filters:
+            raise ValueError("delete_where requires at least one filter")
+
+        stmt = delete(self.model).where(*self._equality_conditions(filters)).returning(self.model)
+        result = await db.scalars(stmt)
+        db_objs = cast(list[ModelType], list(result.all()))
+        await db.commit()
+        await self._notify_write(*(db_obj.id for db_obj in db_objs))
+        return db_objs
 
     async def delete_multi(self, db: AsyncSession, *, ids: list[Any]) -> int:
         """
@@ -146,6 +452,7 @@ class BaseRepository(Generic[ModelType]):
         stmt = delete(self.model).where(self.model.id.in_(ids))
         result = await db.execute(stmt)
         await db.commit()
+        await self._notify_write(*ids)
         return result.rowcount
 
     async def count(self, db: AsyncSession) -> int:
@@ -156,6 +463,44 @@ class BaseRepository(Generic[ModelType]):
         result = await db.execute(stmt)
         return cast(int, result.scalar())
 
+    async def count_total(
+        self,
+        db: AsyncSession,
+        *,
+        strategy: CountStrategy = CountStrategy.EXACT,
+        filters: dict[str, Any] | None = None,
+    ) -> TotalCount:
+        """
+        Count records matching `filters` with the given strategy
+
+        * `exact`: `SELECT count(id)`
+        * `cached`: exact count, reused for `count_cache_ttl_seconds`
+        * `estimate`: Postgres planner estimate, falls back to an exact count
+          for small tables or other databases
+        """
+        conditions = self._equality_conditions(filters)
+        count_stmt = select(func.count(self.model.id)).where(*conditions)
+
+        if strategy == CountStrategy.CACHED:
+            cache_key = tuple(sorted((filters or {}).items()))
+            total = self._count_cache.get(cache_key)
+            if total is not None:
+                return TotalCount(total, exact=False)
+            total = cast(int, (await db.execute(count_stmt)).scalar())
+            self._count_cache.set(cache_key, total)
+            return TotalCount(total, exact=True)
+
+        if strategy == CountStrategy.ESTIMATE and db.get_bind().dialect.name == "postgresql":
+            if conditions:
+                estimate = await estimate_query_rows(db, select(self.model.id).where(*conditions))
+            else:
+                estimate = await estimate_table_rows(db, self.model.__table__.fullname)
+            if estimate is not None and estimate >= get_settings().count_estimate_min_rows:
+                return TotalCount(estimate, exact=False)
+
+        total = cast(int, (await db.execute(count_stmt)).scalar())
+        return TotalCount(total, exact=True)
+
     async def exists(self, db: AsyncSession, *, id: Any) -> bool:
         """
         Check if a record exists by ID
@@ -164,6 +509,35 @@ class BaseRepository(Generic[ModelType]):
         result = await db.execute(stmt)
         return result.first() is not None
 
+    async def create_unique(
+        self,
+        db: AsyncSession,
+        *,
+        obj_in: BaseModel | dict[str, Any],
+        conflict_columns: list[str]
+    ) -> ModelType | None:
+        """
+        Create a record with a single `INSERT ... ON CONFLICT DO NOTHING RETURNING`
+        statement. `conflict_columns` must match a unique constraint
+        Returns the new record, or None if a record with the same
+        `conflict_columns` values already exists
+        """
+        if not conflict_columns:
+            raise ValueError("create_unique needs the columns of a unique constraint")
+
+        stmt = (
+            self._insert_statement(db)
+            .values(**self._writable_values(obj_in))
+            .on_conflict_do_nothing(index_elements=conflict_columns)
+            .returning(self.model)
+        )
+        instance = (await db.scalars(stmt)).one_or_none()
+        await db.commit()
+        if instance is not None:
+            await self._notify_write(instance.id)
+            self._cache_identity(instance)
+        return instance
+
     async def get_or_create(
         self, 
         db: AsyncSession, 
@@ -172,26 +546,39 @@ class BaseRepository(Generic[ModelType]):
         **kwargs
     ) -> tuple[ModelType, bool]:
         """
-        Get an existing record or create a new one
+        Get an existing record or create a new one, atomically.
+        The `kwargs` columns must match a unique constraint
+        Inserts first and only selects when the record already exists, so
+        creating is one round trip and concurrent callers never collide
         Returns tuple of (object, created_flag)
+
+        Raises:
+            RecordConflictException: if the insert keeps conflicting but no
+                record matches `kwargs`, e.g. on another unique constraint.
         """
-        # Build the where clause dynamically
-        conditions = [getattr(self.model, key) == value for key, value in kwargs.items()]
-        stmt = select(self.model).where(and_(*conditions))
-        result = await db.execute(stmt)
-        instance = result.scalar_one_or_none()
-        
-        if instance:
-            return instance, False
-        else:
-            params = dict((k, v) for k, v in kwargs.items())
-            if defaults:
-                params.update(defaults)
-            instance = self.model(**params)
-            db.add(instance)
-            await db.commit()
-            await db.refresh(instance)
-            return instance, True
+        if not kwargs:
+            raise ValueError("get_or_create needs the columns of a unique constraint")
+
+        params = dict(kwargs)
+        if defaults:
+            params.update(defaults)
+
+        for _ in range(GET_OR_CREATE_ATTEMPTS):
+            instance = await self.create_unique(
+                db, obj_in=params, conflict_columns=list(kwargs)
+            )
+            if instance is not None:
+                return instance, True
+
+            stmt = select(self.model).where(and_(*self._equality_conditions(kwargs)))
+            instance = (await db.execute(stmt)).scalar_one_or_none()
+            # Deleted right after the conflict, try creating it again
+            if instance is not None:
+                return instance, False
+
+        raise RecordConflictException(
+            f"{self.model.__name__} conflicts with an existing record not matching {sorted(kwargs)}"
+        )
 
     async def bulk_create(self, db: AsyncSession, *, objs_in: list[BaseModel | dict]) -> None:
         """
@@ -201,32 +588,180 @@ class BaseRepository(Generic[ModelType]):
         objects_data = [jsonable_encoder(obj) for obj in objs_in]
         await db.execute(insert(self.model), objects_data)
         await db.commit()
+        await self._notify_write()
+
+    async def bulk_upsert(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: list[BaseModel | dict],
+        conflict_columns: list[str] | None = None,
+        update_columns: list[str] | None = None,
+        chunk_size: int | None = None,
+        returning: Literal["models", "rows"] = "models",
+    ) -> list[ModelType] | list[RowMapping]:
+        """
+        Insert or update many records, one `INSERT ... ON CONFLICT ... RETURNING`
+        statement per chunk, all in one transaction
+
+        * `conflict_columns`: unique columns identifying existing rows. Without
+          them rows are plainly inserted
+        * `update_columns`: columns overwritten on conflict, defaults to every
+          inserted column except the conflict columns. An empty list means
+          `DO NOTHING`, and skipped rows are not returned
+        * `chunk_size`: rows per statement, defaults to `bulk_chunk_size`
+        * `returning`: `models` for ORM objects, `rows` for plain row mappings
+          which skip ORM hydration
+        """
+        if not objs_in:
+            return []
+
+        stmt = self._insert_statement(db)
+        rows = [self._to_dict(obj_in) for obj_in in objs_in]
+
+        if conflict_columns:
+            if update_columns is None:
+                update_columns = [
+                    column for column in rows[0] if column not in conflict_columns and column != "id"
+                ]
+            if update_columns:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=conflict_columns,
+                    set_={column: stmt.excluded[column] for column in update_columns},
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+
+        chunk_size = chunk_size or get_settings().bulk_chunk_size
+        options = {"insertmanyvalues_page_size": chunk_size}
+
+        results: list = []
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            if returning == "rows":
+                result = await db.execute(
+                    stmt.returning(*self.model.__table__.columns), chunk,
+                    execution_options=options,
+                )
+                results.extend(result.mappings().all())
+            else:
+                result = await db.scalars(
+                    stmt.returning(self.model), chunk,
+                    execution_options={**options, "populate_existing": True},
+                )
+                results.extend(result.all())
+
+        await db.commit()
+        if conflict_columns:
+            await self._notify_write(*(row["id"] if returning == "rows" else row.id for row in results))
+        else:
+            await self._notify_write()
+        return results
+
+    async def bulk_copy(self, db: AsyncSession, *, objs_in: list[BaseModel | dict]) -> int:
+        """
+        Insert many records with Postgres `COPY`, the fastest path for large
+        imports. No conflict handling and nothing is returned.
+        Falls back to `bulk_create` on drivers other than asyncpg
+        Returns the number of copied records
+        """
+        if not objs_in:
+            return 0
+
+        rows = [self._to_dict(obj_in) for obj_in in objs_in]
+        connection = await db.connection()
+        if connection.dialect.driver != "asyncpg":
+            await self.bulk_create(db, objs_in=rows)
+            return len(rows)
+
+        columns = list(rows[0])
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            self.model.__table__.name,
+            schema_name=self.model.__table__.schema,
+            columns=columns,
+            records=[tuple(row[column] for column in columns) for row in rows],
+        )
+        await db.commit()
+        await self._notify_write()
+        return len(rows)
 
     async def filter_by(
         self,
         db: AsyncSession,
         *,
-        filters: dict[str, Any],
+        filters: dict[str, Any] | list[FilterCondition],
         skip: int = 0,
         limit: int = 100,
-        order_by: str | None = None
-    ) -> list[ModelType]:
-        """
-        Filter records by multiple attributes
-        """
-        stmt = select(self.model)
-        
-        # Apply filters
-        for attr, value in filters.items():
-            if hasattr(self.model, attr):
-                stmt = stmt.where(getattr(self.model, attr) == value)
-        
-        # Apply ordering
-        if order_by and hasattr(self.model, order_by):
-            stmt = stmt.order_by(getattr(self.model, order_by))
-        
-        # Apply pagination
-        stmt = stmt.offset(skip).limit(limit)
-        
-        result = await db.execute(stmt)
-        return cast(list[ModelType], result.scalars().all())
\ No newline at end of file
+        order_by: str | list[str] | None = None,
+        fields: list[str] | None = None
+    ) -> list[ModelType] | list[dict[str, Any]]:
+        """
+        Filter records by equality (`filters` as a dict) or by filter conditions
+        supporting ranges, IN, ILIKE and null checks. Meant for client input,
+        so neither form may use `private_fields`
+        `order_by` takes one or more fields, prefixed with - for descending
+        Returns models, or plain dicts with only `fields` when given
+        """
+        stmt, params = self._filter_statement(filters, order_by, fields)
+        result = await db.execute(stmt, {**params, "_skip": skip, "_limit": limit})
+
+        if fields:
+            return [dict(row) for row in result.mappings()]
+        return cast(list[ModelType], list(result.scalars().all()))
+
+    async def stream(
+        self,
+        db: AsyncSession,
+        *,
+        filters: dict[str, Any] | list[FilterCondition] | None = None,
+        order_by: str | list[str] | None = "id",
+        fields: list[str] | None = None,
+        batch_size: int | None = None
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        Yield every record matching `filters` as plain dicts, `batch_size`
+        rows at a time, for exports of any size
+        Rows come from a server-side cursor (`AsyncSession.stream`), so only
+        one batch is held in memory. Selects every queryable column unless
+        `fields` are given. Takes the same filters as `filter_by`
+        """
+        fields = fields or [
+            field for field in inspect(self.model).column_attrs.keys()
+            if field in self.queryable_fields
+        ]
+        batch_size = batch_size or get_settings().export_batch_size
+        stmt, params = self._filter_statement(filters or [], order_by, fields, paginate=False)
+
+        result = await db.stream(stmt, params, execution_options={"yield_per": batch_size})
+        async for rows in result.mappings().partitions():
+            yield [dict(row) for row in rows]
+
+    def _filter_statement(
+        self,
+        filters: dict[str, Any] | list[FilterCondition],
+        order_by: str | list[str] | None,
+        fields: list[str] | None,
+        paginate: bool = True
+    ) -> tuple[Select, dict[str, Any]]:
+        """Checked and cached statement for `filter_by` and `stream`, with its bound values"""
+        if isinstance(filters, dict):
+            filters = [
+                FilterCondition(field=attr, op=FilterOperator.ISNULL, value=True)
+                if value is None else FilterCondition(field=attr, value=value)
+                for attr, value in filters.items()
+            ]
+        sort = [order_by] if isinstance(order_by, str) else list(order_by or [])
+
+        allowed_fields = self.queryable_fields
+        for field in sort:
+            if field.lstrip("-") not in allowed_fields:
+                raise InvalidQueryException(f"Cannot order by '{field.lstrip('-')}'")
+        if fields:
+            self._columns(fields)
+
+        shape, params = split_conditions(self.model, filters, allowed_fields)
+        stmt = build_filter_statement(
+            self.model, shape, tuple(sort), tuple(fields) if fields else None, paginate
+        )
+        return stmt, params
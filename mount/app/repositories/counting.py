@@ -0,0 +1,48 @@
+import json
+from typing import NamedTuple
+
+from sqlalchemy import Select, text
+from sqlalchemy.exc import CompileError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class TotalCount(NamedTuple):
+    total: int
+    exact: bool
+
+
+async def estimate_table_rows(db: AsyncSession, table_name: str) -> int | None:
+    """
+    Row count of a whole table from the Postgres planner statistics
+    (`pg_class.reltuples`). None if the table has never been analyzed
+    """
+    stmt = text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)")
+    result = await db.execute(stmt, {"table_name": table_name})
+    estimate = result.scalar()
+    if estimate is None or estimate < 0:
+        return None
+    return int(estimate)
+
+
+async def estimate_query_rows(db: AsyncSession, stmt: Select) -> int | None:
+    """
+    Number of rows the Postgres planner expects `stmt` to return, read from
+    `EXPLAIN`. None if the statement cannot be rendered for explaining
+
+    The statement is rendered with its values inlined and sent to the driver
+    as is: parsing it again as `text()` would read `:word` inside string
+    literals as bind parameters
+    """
+    try:
+        compiled = stmt.compile(
+            dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True}
+        )
+    except CompileError:
+        return None
+
+    connection = await db.connection(bind_arguments={"clause": stmt})
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,138 @@
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import Select, bindparam, inspect, select
+
+from app.database.core import Base
+from app.exceptions.query_exception import InvalidQueryException
+from app.schemas.filter_schema import FilterCondition, FilterOperator
+
+
+# Shape of a filter: (field, operator) pairs, plus the flag for isnull checks
+FilterShape = tuple[tuple[str, FilterOperator, bool | None], ...]
+
+TRUE_VALUES = frozenset({"1", "true", "yes"})
+FALSE_VALUES = frozenset({"0", "false", "no"})
+
+
+def _coerce(model: type[Base], field: str, value: Any) -> Any:
+    """Convert a query string value to the python type of the column"""
+    if not isinstance(value, str):
+        return value
+
+    try:
+        python_type = inspect(model).columns[field].type.python_type
+    except NotImplementedError:
+        return value
+
+    try:
+        if python_type is bool:
+            return _parse_bool(field, value)
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        if python_type is date:
+            return date.fromisoformat(value)
+        if python_type in (int, float, Decimal):
+            return python_type(value)
+    except ValueError:
+        raise InvalidQueryException(f"Invalid value '{value}' for '{field}'")
+    return value
+
+
+def _is_string_column(model: type[Base], field: str) -> bool:
+    try:
+        return inspect(model).columns[field].type.python_type is str
+    except NotImplementedError:
+        return False
+
+
+def _parse_bool(field: str, value: Any) -> bool:
+    if not isinstance(value, str):
+        return bool(value)
+    if value.lower() in TRUE_VALUES:
+        return True
+    if value.lower() in FALSE_VALUES:
+        return False
+    raise InvalidQueryException(f"Invalid value '{value}' for '{field}', expected true or false")
+
+
+def split_conditions(
+    model: type[Base], conditions: list[FilterCondition], allowed_fields: frozenset[str]
+) -> tuple[FilterShape, dict[str, Any]]:
+    """
+    Split filter conditions into their statement shape and the values bound
+    to it, checking fields against `allowed_fields`
+    """
+    shape = []
+    params = {}
+    for index, condition in enumerate(conditions):
+        if condition.field not in allowed_fields:
+            raise InvalidQueryException(f"Cannot filter by '{condition.field}'")
+
+        if condition.op == FilterOperator.ISNULL:
+            shape.append((condition.field, condition.op, _parse_bool(condition.field, condition.value)))
+            continue
+
+        shape.append((condition.field, condition.op, None))
+        if condition.op == FilterOperator.IN:
+            params[f"p{index}"] = [_coerce(model, condition.field, value) for value in condition.value]
+        elif condition.op == FilterOperator.ILIKE:
+            if not _is_string_column(model, condition.field):
+                raise InvalidQueryException(f"Cannot use ilike on '{condition.field}'")
+            params[f"p{index}"] = str(condition.value)
+        else:
+            params[f"p{index}"] = _coerce(model, condition.field, condition.value)
+    return tuple(shape), params
+
+
+@lru_cache(maxsize=512)
+def build_filter_statement(
+    model: type[Base],
+    shape: FilterShape,
+    sort: tuple[str, ...],
+    fields: tuple[str, ...] | None,
+    paginate: bool = True,
+) -> Select:
+    """
+    Select statement for a filter shape, with every value left as a bound
+    parameter. Cached per shape, so repeated queries skip rebuilding the
+    statement and hit SQLAlchemy's compiled cache. Paginated statements
+    also take `_skip` and `_limit` parameters
+    """
+    if fields:
+        stmt = select(*(getattr(model, field) for field in fields))
+    else:
+        stmt = select(model)
+
+    for index, (field, op, flag) in enumerate(shape):
+        column = getattr(model, field)
+        param = bindparam(f"p{index}", expanding=op == FilterOperator.IN)
+        match op:
+            case FilterOperator.EQ:
+                stmt = stmt.where(column == param)
+            case FilterOperator.NE:
+                stmt = stmt.where(column != param)
+            case FilterOperator.GT:
+                stmt = stmt.where(column > param)
+            case FilterOperator.GTE:
+                stmt = stmt.where(column >= param)
+            case FilterOperator.LT:
+                stmt = stmt.where(column < param)
+            case FilterOperator.LTE:
+                stmt = stmt.where(column <= param)
+            case FilterOperator.IN:
+                stmt = stmt.where(column.in_(param))
+            case FilterOperator.ILIKE:
+                stmt = stmt.where(column.ilike(param))
+            case FilterOperator.ISNULL:
+                stmt = stmt.where(column.is_(None) if flag else column.is_not(None))
+
+    for field in sort:
+        column = getattr(model, field.lstrip("-"))
+        stmt = stmt.order_by(column.desc() if field.startswith("-") else column.asc())
+
+    if not paginate:
+        return stmt
+    return stmt.offset(bindparam("_skip")).limit(bindparam("_limit"))
@@ -0,0 +1,120 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.core import utcnow
+from app.database.models.job import Job, JobStatus
+from app.repositories.base_repository import BaseRepository
+
+
+class JobRepository(BaseRepository[Job]):
+
+    async def enqueue(
+        self,
+        db: AsyncSession,
+        *,
+        name: str,
+        payload: dict[str, Any],
+        max_attempts: int,
+        run_at: datetime,
+        created_by: int | None = None,
+    ) -> Job:
+        """
+        Queue a new job. Unlike `create` the values are used as is, so
+        `run_at` keeps its datetime type
+        """
+        db_obj = self.model(
+            name=name,
+            payload=payload,
+            status=JobStatus.QUEUED.value,
+            attempts=0,
+            max_attempts=max_attempts,
+            run_at=run_at,
+            created_by=created_by,
+        )
+        db.add(db_obj)
+        await db.commit()
+        await self._notify_write(db_obj.id)
+        return db_obj
+
+    async def has_pending(self, db: AsyncSession, name: str) -> bool:
+        """Whether a job called `name` is queued or running, read from the primary"""
+        stmt = (
+            select(self.model.id)
+            .where(
+                self.model.name == name,
+                self.model.status.in_([JobStatus.QUEUED.value, JobStatus.RUNNING.value]),
+            )
+            .limit(1)
+        )
+        result = await db.execute(stmt, bind_arguments={"use_primary": True})
+        return result.scalar() is not None
+
+    async def claim(self, db: AsyncSession, *, limit: int, exclude_names: list[str] | None = None) -> list[Job]:
+        """
+        Mark up to `limit` due jobs as running and return them, oldest due
+        first. Rows locked by another worker's claim are skipped, so workers
+        never claim the same job
+        """
+        now = utcnow()
+        due = (
+            select(self.model.id)
+            .where(self.model.status == JobStatus.QUEUED.value, self.model.run_at <= now)
+            .order_by(self.model.run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        if exclude_names:
+            due = due.where(self.model.name.not_in(exclude_names))
+
+        stmt = (
+            update(self.model)
+            .where(self.model.id.in_(due))
+            .values(status=JobStatus.RUNNING.value, locked_at=now, attempts=self.model.attempts + 1)
+            .returning(self.model)
+        )
+        result = await db.scalars(stmt, execution_options={"populate_existing": True})
+        jobs = list(result.all())
+        await db.commit()
+        return jobs
+
+    async def mark_succeeded(self, db: AsyncSession, *, id: int, result: dict[str, Any] | None) -> None:
+        await self.update_by_id(db, id=id, obj_in={
+            "status": JobStatus.SUCCEEDED.value,
+            "locked_at": None,
+            "last_error": None,
+            "result": result,
+        })
+
+    async def mark_failed(self, db: AsyncSession, *, id: int, error: str, retry_at: datetime | None) -> None:
+        """Queue the job again at `retry_at`, or fail it for good when None"""
+        await self.update_by_id(db, id=id, obj_in={
+            "status": JobStatus.QUEUED.value if retry_at else JobStatus.FAILED.value,
+            "locked_at": None,
+            "last_error": error,
+            **({"run_at": retry_at} if retry_at else {}),
+        })
+
+    async def requeue_stale(self, db: AsyncSession, *, locked_before: datetime) -> int:
+        """
+        Recover jobs left running by a worker which died, queueing them
+        again or failing them once out of attempts
+        Returns the number of recovered jobs
+        """
+        stale = (self.model.status == JobStatus.RUNNING.value, self.model.locked_at < locked_before)
+        requeued = await db.execute(
+            update(self.model)
+            .where(*stale, self.model.attempts < self.model.max_attempts)
+            .values(status=JobStatus.QUEUED.value, locked_at=None, run_at=utcnow())
+        )
+        failed = await db.execute(
+            update(self.model)
+            .where(*stale)
+            .values(status=JobStatus.FAILED.value, locked_at=None, last_error="Worker lost while running")
+        )
+        await db.commit()
+        return requeued.rowcount + failed.rowcount
+
+job_repo = JobRepository(Job)
@@ -0,0 +1,70 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import Column
+
+from app.exceptions.query_exception import InvalidCursorException
+
+
+def encode_cursor(order_by: str, value: Any, id: Any) -> str:
+    """Opaque cursor pointing just past the row `(value, id)`"""
+    raw = json.dumps([order_by, jsonable_encoder(value), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def decode_cursor(cursor: str, *, order_by: str, column: Column) -> tuple[Any, Any]:
+    """
+    Decode a cursor made by `encode_cursor` back into `(value, id)`, converting
+    the value to the python type of the ordering column
+
+    Raises:
+        InvalidCursorException: if the cursor is malformed, was issued for a
+            different ordering, or its values don't fit the columns.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_order_by, value, id = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursorException()
+
+    if cursor_order_by != order_by or not _is_int(id):
+        raise InvalidCursorException()
+
+    if value is None:
+        return value, id
+
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value, id
+
+    try:
+        if python_type is datetime:
+            return datetime.fromisoformat(value), id
+        if python_type is date:
+            return date.fromisoformat(value), id
+        if python_type is Decimal:
+            if not isinstance(value, (int, float, str)) or isinstance(value, bool):
+                raise InvalidCursorException()
+            return Decimal(str(value)), id
+    except (ValueError, TypeError, ArithmeticError):
+        raise InvalidCursorException()
+
+    # Anything else sent back by a client must already be of the column's
+    # JSON type, the database would reject it otherwise
+    if python_type is float and _is_int(value):
+        value = float(value)
+    if python_type in (int, float, str, bool) and (
+        not isinstance(value, python_type) or isinstance(value, bool) != (python_type is bool)
+    ):
+        raise InvalidCursorException()
+    return value, id
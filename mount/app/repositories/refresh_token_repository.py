@@ -0,0 +1,101 @@
+from datetime import timedelta
+from uuid import uuid4
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.tokens import generate_refresh_token, hash_refresh_token
+from app.database.core import utcnow
+from app.database.models.refresh_token import RefreshToken
+from app.repositories.base_repository import BaseRepository
+
+
+class RefreshTokenRepository(BaseRepository[RefreshToken]):
+    private_fields = frozenset({"token_hash"})
+
+    async def issue(self, db: AsyncSession, *, user_id: int, family_id: str | None = None) -> str:
+        """
+        Store a new refresh token for a user, starting a new token family
+        unless `family_id` is given
+        Returns the plain token, which is never stored
+        """
+        token = generate_refresh_token()
+        await db.execute(insert(self.model).values(
+            user_id=user_id,
+            token_hash=hash_refresh_token(token),
+            family_id=family_id or uuid4().hex,
+            expires_at=utcnow() + timedelta(days=get_settings().refresh_token_expiration_days),
+        ))
+        await db.commit()
+        return token
+
+    async def rotate(self, db: AsyncSession, *, token: str) -> tuple[int, str] | None:
+        """
+        Revoke a valid refresh token and issue its successor in the same
+        family, in one transaction. Presenting an already rotated token
+        revokes its whole family, since either it or its successor leaked
+        Returns the user id and the new token, or None if the token is
+        unknown, expired or revoked
+        """
+        now = utcnow()
+        token_hash = hash_refresh_token(token)
+
+        stmt = (
+            update(self.model)
+            .where(
+                self.model.token_hash == token_hash,
+                self.model.revoked_at.is_(None),
+                self.model.expires_at > now,
+            )
+            .values(revoked_at=now)
+            .returning(self.model.user_id, self.model.family_id)
+        )
+        row = (await db.execute(stmt)).first()
+
+        if row is None:
+            reused_family = (
+                select(self.model.family_id)
+                .where(self.model.token_hash == token_hash, self.model.revoked_at.is_not(None))
+                .scalar_subquery()
+            )
+            await db.execute(
+                update(self.model)
+                .where(self.model.family_id == reused_family, self.model.revoked_at.is_(None))
+                .values(revoked_at=now)
+            )
+            await db.commit()
+            return None
+
+        return row.user_id, await self.issue(db, user_id=row.user_id, family_id=row.family_id)
+
+    async def revoke(self, db: AsyncSession, *, token: str) -> bool:
+        """
+        Revoke a refresh token together with the rest of its family, ending
+        that login session
+        Returns False if the token is unknown
+        """
+        family_id = await db.scalar(
+            select(self.model.family_id).where(self.model.token_hash == hash_refresh_token(token))
+        )
+        if family_id is None:
+            return False
+
+        await db.execute(
+            update(self.model)
+            .where(self.model.family_id == family_id, self.model.revoked_at.is_(None))
+            .values(revoked_at=utcnow())
+        )
+        await db.commit()
+        return True
+
+    async def purge_expired(self, db: AsyncSession) -> int:
+        """
+        Delete expired refresh tokens, revoked ones included
+        Returns the number of deleted tokens
+        """
+        result = await db.execute(delete(self.model).where(self.model.expires_at <= utcnow()))
+        await db.commit()
+        return result.rowcount
+
+refresh_token_repo = RefreshTokenRepository(RefreshToken)
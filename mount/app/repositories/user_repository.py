@@ -2,25 +2,29 @@
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.hashing import password_hasher
 from app.database.models.user import User
 from app.repositories.base_repository import BaseRepository
 from app.schemas.user_schema import UserCreateRequest
 
 
 class UserRepository(BaseRepository[User]):
-    
-    async def create_with_hash(self, db: AsyncSession, *, obj: UserCreateRequest) -> User:
-        
-        user_obj = User()
-        user_obj.email = obj.email
-        user_obj.full_name = obj.full_name
-        user_obj.set_password(obj.password)
-        
-        db.add(user_obj)
+    private_fields = frozenset({"password_hash"})
+    identity_cache_ttl = 60
 
-        await db.commit()
-        await db.refresh(user_obj)
-
-        return user_obj
+    async def create_with_hash(self, db: AsyncSession, *, obj: UserCreateRequest) -> User | None:
+        """
+        Create a user with a hashed password in one round trip
+        Returns None if a user with the same email already exists
+        """
+        return await self.create_unique(
+            db,
+            obj_in={
+                "email": obj.email,
+                "full_name": obj.full_name,
+                "password_hash": await password_hasher.hash(obj.password),
+            },
+            conflict_columns=["email"],
+        )
 
 user_repo = UserRepository(User)
\ No newline at end of file
@@ -0,0 +1,98 @@
+from enum import Enum
+from typing import Any
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
+from app.exceptions.query_exception import InvalidQueryException
+
+
+class FilterOperator(str, Enum):
+    EQ = "eq"
+    NE = "ne"
+    GT = "gt"
+    GTE = "gte"
+    LT = "lt"
+    LTE = "lte"
+    IN = "in"
+    ILIKE = "ilike"
+    ISNULL = "isnull"
+
+
+FILTER_OPERATORS = frozenset(op.value for op in FilterOperator)
+
+
+class FilterCondition(BaseModel):
+    field: str
+    op: FilterOperator = FilterOperator.EQ
+    value: Any = None
+
+    model_config = ConfigDict(frozen=True)
+
+    @classmethod
+    def parse(cls, raw: str) -> "FilterCondition":
+        """
+        Parse `field:operator:value`, or `field:value` for equality.
+        `in` takes comma separated values, `isnull` takes true or false.
+        Values may contain colons, e.g. `created_at:2024-01-01T10:00:00`: the
+        second segment is only an operator when it is a known one
+        """
+        field, separator, rest = raw.partition(":")
+        if not separator or not field:
+            raise InvalidQueryException(f"Invalid filter '{raw}', expected field:operator:value or field:value")
+
+        operator, separator, value = rest.partition(":")
+        if separator and operator in FILTER_OPERATORS:
+            op = FilterOperator(operator)
+        else:
+            op, value = FilterOperator.EQ, rest
+
+        if op == FilterOperator.IN:
+            return cls(field=field, op=op, value=tuple(value.split(",")))
+        return cls(field=field, op=op, value=value)
+
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class QueryParams(BaseModel):
+    filter: list[str] = Field(
+        [],
+        description=(
+            "Filters as `field:operator:value`. Operators: eq, ne, gt, gte, lt, lte, "
+            "in (comma separated values), ilike, isnull (true/false). "
+            "`field:value` is shorthand for eq"
+        ),
+        examples=[["email:ilike:%@school.org", "id:gte:10"]],
+    )
+    sort: str | None = Field(None, description="Comma separated fields, prefix with - for descending")
+    fields: str | None = Field(None, description="Comma separated fields to return")
+
+    _conditions: list[FilterCondition] = PrivateAttr(default_factory=list)
+
+    @model_validator(mode="after")
+    def parse_filters(self) -> "QueryParams":
+        self._conditions = [FilterCondition.parse(raw) for raw in self.filter]
+        return self
+
+    @property
+    def conditions(self) -> list[FilterCondition]:
+        return self._conditions
+
+    @property
+    def sort_fields(self) -> list[str]:
+        return [field.strip() for field in (self.sort or "").split(",") if field.strip()]
+
+    @property
+    def field_list(self) -> list[str] | None:
+        if not self.fields:
+            return None
+        return [field.strip() for field in self.fields.split(",") if field.strip()]
+
+
+class FilterParams(QueryParams):
+    skip: int = Field(0, ge=0, description="Number of items to skip")
+    limit: int = Field(100, ge=1, le=500, description="Number of items to return")
+
+
+class ExportParams(QueryParams):
+    format: ExportFormat = Field(ExportFormat.CSV, description="csv, or ndjson for one JSON object per line")
@@ -0,0 +1,50 @@
+from pydantic import BaseModel
+
+
+class DBPoolStats(BaseModel):
+    pool_size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int = 0
+    avg_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+
+
+class PasswordHasherStats(BaseModel):
+    executor: str
+    rounds: int
+    max_workers: int
+    queue_depth: int
+    in_flight: int
+    rejected: int
+    completed: int
+    avg_latency_ms: float
+    max_latency_ms: float
+
+
+class RateLimiterStats(BaseModel):
+    backend: str
+    allowed: int
+    rejected: int
+
+
+class ResponseCacheStats(BaseModel):
+    backend: str
+    hits: int
+    misses: int
+    not_modified: int
+
+
+class IdentityCacheStats(BaseModel):
+    hits: int
+    misses: int
+
+
+class RuntimeStats(BaseModel):
+    db_pool: DBPoolStats
+    db_replica_pools: list[DBPoolStats] = []
+    password_hasher: PasswordHasherStats
+    rate_limiter: RateLimiterStats
+    response_cache: ResponseCacheStats
+    identity_cache: dict[str, IdentityCacheStats] = {}
@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Any
+from pydantic import BaseModel, ConfigDict, Field
+from app.schemas.base_schema import DBBaseModel
+
+MAX_DELAY_SECONDS = 30 * 24 * 60 * 60
+
+
+class JobRead(DBBaseModel):
+    name: str
+    status: str
+    attempts: int
+    max_attempts: int
+    run_at: datetime
+    last_error: str | None = None
+    result: dict[str, Any] | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class JobEnqueueRequest(BaseModel):
+    payload: dict[str, Any] = {}
+    delay_seconds: float = Field(0, ge=0, le=MAX_DELAY_SECONDS, description="Seconds before the job is due")
@@ -1,8 +1,15 @@
+from enum import Enum
 from typing import Generic, TypeVar
 from pydantic import BaseModel, Field
 
 PaginatedData = TypeVar("PaginatedData")
 
+
+class CountStrategy(str, Enum):
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATE = "estimate"
+
 class PaginationParams(BaseModel):
     page: int = Field(..., description="Page number")
     per_page: int = Field(10, description="Number of itmes to show per page")
@@ -11,4 +18,21 @@ class PaginationParams(BaseModel):
 class PaginatedResponse(BaseModel, Generic[PaginatedData]):
     page: int
     total_pages: int
+    total_exact: bool = True
+    data: list[PaginatedData] = Field([])
+
+
+class CursorPaginationParams(BaseModel):
+    cursor: str | None = Field(None, description="Cursor returned with the previous page")
+    per_page: int = Field(10, ge=1, le=100, description="Number of items to show per page")
+    order_by: str = Field("id", description="Field to order by")
+    descending: bool = Field(False, description="Order in descending order")
+    count: CountStrategy | None = Field(None, description="Include the total count, computed with this strategy")
+
+
+class CursorPaginatedResponse(BaseModel, Generic[PaginatedData]):
+    next_cursor: str | None = None
+    has_more: bool = False
+    total: int | None = None
+    total_exact: bool | None = None
     data: list[PaginatedData] = Field([])
\ No newline at end of file
@@ -8,6 +8,22 @@ class UserRead(DBBaseModel):
     password_hash: str
 
 
+class UserPublic(DBBaseModel):
+    full_name: str
+    email: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CurrentUser(BaseModel):
+    """Authenticated principal of a request"""
+    id: int
+    full_name: str
+    email: str
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
 class UserCreateRequest(BaseModel):
     full_name: str = Field(..., examples=["John Doe"])
     email: str = Field(..., examples=['john@example.com'])
@@ -16,6 +32,7 @@ class UserCreateRequest(BaseModel):
 
 class TokenResponse(BaseModel):
     access_token: str
+    refresh_token: str
     user: UserRead
 
     model_config = ConfigDict(from_attributes=True)
@@ -23,4 +40,13 @@ class TokenResponse(BaseModel):
 
 class TokenRequest(BaseModel):
     email: str = Field(..., examples=['john@example.com'])
-    password: str = Field(..., examples=['topsecret'])
\ No newline at end of file
+    password: str = Field(..., examples=['topsecret'])
+
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
+
+
+class RefreshTokenResponse(BaseModel):
+    access_token: str
+    refresh_token: str
@@ -1,10 +1,33 @@
-from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
 
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core import logger
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.core.hashing import password_hasher
+from app.core.tokens import create_access_token
+from app.database.routing import set_consistency_key
 from app.database.models import User
-from app.exceptions.user_exception import InvalidUsernamePasswordException, UserAlreadyExistsException
-from app.schemas.user_schema import UserCreateRequest
+from app.exceptions.user_exception import (
+    InvalidRefreshTokenException,
+    InvalidUsernamePasswordException,
+    UserAlreadyExistsException,
+)
+from app.schemas.user_schema import CurrentUser, UserCreateRequest
+from app.repositories.refresh_token_repository import refresh_token_repo
 from app.repositories.user_repository import user_repo
 
+current_user_cache: TTLCache[int, CurrentUser] = TTLCache(
+    maxsize=get_settings().auth_user_cache_size,
+    ttl=get_settings().auth_user_cache_ttl_seconds,
+)
+
+user_repo.add_write_listener(current_user_cache.pop)
+
+# Strong references to running rehash tasks, so they aren't garbage collected
+_rehash_tasks: set[asyncio.Task] = set()
+
 
 async def create_user(db: AsyncSession, *, data: UserCreateRequest) -> User:
     """Creates a user in database
@@ -20,21 +43,31 @@ async def create_user(db: AsyncSession, *, data: UserCreateRequest) -> User:
         User: returns newly created user
     """
 
-    existing_user_obj = await user_repo.get_by_attribute(db, attribute="email", value=data.email)
+    # A login right after registering must find the user even under replica lag
+    set_consistency_key(f"email:{data.email}")
+    user_obj = await user_repo.create_with_hash(db, obj=data)
 
-    if existing_user_obj is not None:
+    if user_obj is None:
         raise UserAlreadyExistsException(data.email)
 
-    return await user_repo.create_with_hash(db, obj=data)
+    return user_obj
 
 
-async def authenticate_user(db: AsyncSession, *, email: str, password: str) -> User:
+async def authenticate_user(
+    db: AsyncSession,
+    *,
+    email: str,
+    password: str,
+    session_factory: async_sessionmaker[AsyncSession],
+) -> User:
     """Get a user from DB and verifies password
 
     Args:
         db (AsyncSession): Asynchronous Sqlalchemy database session object
         email (str): email of the targer user
         password (str): password of the target user
+        session_factory (async_sessionmaker): the app's session factory,
+            used to rehash the password after the request
 
     Raises:
         HTTPException: If the user is not authentic, HTTPException is raised
@@ -43,12 +76,139 @@ async def authenticate_user(db: AsyncSession, *, email: str, password: str) -> U
         User: Returns the user if authentic
     """
 
+    set_consistency_key(f"email:{email}")
     user_obj = await user_repo.get_by_attribute(db, attribute="email", value=email)
 
     if user_obj is None:
         raise InvalidUsernamePasswordException()
 
-    if not user_obj.verify_password(password):
+    if not await password_hasher.verify(password, user_obj.password_hash):
         raise InvalidUsernamePasswordException()
 
+    if get_settings().password_rehash_on_login and password_hasher.needs_rehash(user_obj.password_hash):
+        task = asyncio.create_task(
+            _rehash_password(session_factory, user_obj.id, password, user_obj.password_hash)
+        )
+        _rehash_tasks.add(task)
+        task.add_done_callback(_rehash_tasks.discard)
+
     return user_obj
+
+
+async def _rehash_password(
+    session_factory: async_sessionmaker[AsyncSession], user_id: int, password: str, old_hash: str
+) -> None:
+    """Rehash a password with the current cost, off the login request
+
+    Runs in its own session since the request's one is gone by then. The
+    update only applies while the stored hash is still `old_hash`, so a
+    password change in the meantime is never overwritten.
+    """
+
+    try:
+        password_hash = await password_hasher.hash(password)
+        async with session_factory() as db:
+            await user_repo.update_where(
+                db,
+                filters={"id": user_id, "password_hash": old_hash},
+                obj_in={"password_hash": password_hash},
+            )
+    except Exception as exc:
+        # Not fatal, the next login tries again
+        logger.exception("Password rehash failed", exc, user_id=user_id)
+
+
+async def issue_tokens(db: AsyncSession, *, user: User) -> dict:
+    """Issue an access token and a refresh token starting a new session
+
+    Args:
+        db (AsyncSession): Asynchronous Sqlalchemy database session object
+        user (User): an authenticated user
+
+    Returns:
+        dict: `access_token`, `refresh_token` and `user`
+    """
+
+    # The user's first authenticated requests then read from the primary
+    set_consistency_key(str(user.id))
+    return {
+        "access_token": user.token,
+        "refresh_token": await refresh_token_repo.issue(db, user_id=user.id),
+        "user": user,
+    }
+
+
+async def refresh_tokens(db: AsyncSession, *, refresh_token: str) -> dict:
+    """Exchange a refresh token for a new access token and refresh token
+
+    No password is involved, so renewing a session costs a couple of
+    indexed queries instead of a bcrypt check.
+
+    Args:
+        db (AsyncSession): Asynchronous Sqlalchemy database session object
+        refresh_token (str): refresh token issued by `issue_tokens` or a previous refresh
+
+    Raises:
+        InvalidRefreshTokenException: If the token is unknown, expired, revoked or its user is gone
+
+    Returns:
+        dict: `access_token` and `refresh_token`
+    """
+
+    rotated = await refresh_token_repo.rotate(db, token=refresh_token)
+    if rotated is None:
+        raise InvalidRefreshTokenException()
+
+    user_id, new_refresh_token = rotated
+    current_user = await get_current_user(db, claims={"sub": user_id})
+    if current_user is None:
+        raise InvalidRefreshTokenException()
+
+    return {
+        "access_token": create_access_token(current_user),
+        "refresh_token": new_refresh_token,
+    }
+
+
+async def revoke_refresh_token(db: AsyncSession, *, refresh_token: str) -> None:
+    """Revoke a refresh token and every token rotated from the same login
+
+    Args:
+        db (AsyncSession): Asynchronous Sqlalchemy database session object
+        refresh_token (str): refresh token of the session to end
+    """
+
+    await refresh_token_repo.revoke(db, token=refresh_token)
+
+
+async def get_current_user(db: AsyncSession, *, claims: dict) -> CurrentUser | None:
+    """Resolve the user a verified token was issued for
+
+    With `auth_trust_token_claims` enabled the user is built from the token
+    claims alone. Otherwise it is served from the in-process cache, falling
+    back to the database on a miss.
+
+    Args:
+        db (AsyncSession): Asynchronous Sqlalchemy database session object
+        claims (dict): decoded claims of a verified access token
+
+    Returns:
+        CurrentUser | None: The authenticated user, or None if it no longer exists
+    """
+
+    user_id = int(claims["sub"])
+
+    if get_settings().auth_trust_token_claims and "email" in claims:
+        return CurrentUser(id=user_id, full_name=claims.get("name", ""), email=claims["email"])
+
+    current_user = current_user_cache.get(user_id)
+    if current_user is not None:
+        return current_user
+
+    user_obj = await user_repo.get(db, id=user_id)
+    if user_obj is None:
+        return None
+
+    current_user = CurrentUser.model_validate(user_obj)
+    current_user_cache.set(user_id, current_user)
+    return current_user
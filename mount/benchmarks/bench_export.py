@@ -0,0 +1,94 @@
+"""
+Peak memory of exporting a large table: `BaseRepository.stream` encoded
+batch by batch, as `/users/export` does, versus loading every record with
+`get_multi` and serializing them in one piece.
+
+Each mode runs in its own process so peak RSS figures don't mix. Uses a
+SQLite file (needs `aiosqlite`) with a million users by default; set
+BENCH_ROWS to change it.
+
+    cd mount && python -m benchmarks.bench_export
+"""
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.exports import encode_csv
+from app.database.core import Base, get_session_factory
+from app.database.models import User
+from app.repositories.user_repository import user_repo
+from app.schemas.user_schema import UserPublic
+
+ROWS = int(os.environ.get("BENCH_ROWS", 1_000_000))
+FIELDS = user_repo.schema_fields(UserPublic)
+
+
+def create_table(path: str) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    now = datetime.now()
+    with engine.begin() as connection:
+        for start in range(0, ROWS, 50_000):
+            connection.execute(insert(User), [
+                {
+                    "full_name": f"User {i}",
+                    "email": f"user{i}@school.org",
+                    "password_hash": "x" * 60,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(start, min(start + 50_000, ROWS))
+            ])
+    engine.dispose()
+
+
+async def export_streamed(db) -> int:
+    size = len(encode_csv([], FIELDS, header=True))
+    async for rows in user_repo.stream(db, fields=FIELDS):
+        size += len(encode_csv(rows, FIELDS))
+    return size
+
+
+async def export_loaded(db) -> int:
+    users = await user_repo.get_multi(db, limit=ROWS)
+    rows = [{field: getattr(user, field) for field in FIELDS} for user in users]
+    return len(encode_csv(rows, FIELDS, header=True))
+
+
+async def run(mode: str, path: str) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    export = export_streamed if mode == "stream" else export_loaded
+
+    started = time.perf_counter()
+    async with get_session_factory(engine)() as db:
+        size = await export(db)
+    elapsed = time.perf_counter() - started
+    await engine.dispose()
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode:<8} {size / 1024 / 1024:>8.1f} MB of CSV  {elapsed:>6.1f} s  peak RSS {peak_mb:>8.1f} MB")
+
+
+def main() -> None:
+    if len(sys.argv) == 3:
+        asyncio.run(run(sys.argv[1], sys.argv[2]))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "export.db")
+        print(f"creating {ROWS:,} users...")
+        create_table(path)
+        for mode in ("stream", "load"):
+            subprocess.run([sys.executable, "-m", "benchmarks.bench_export", mode, path], check=True)
+
+
+if __name__ == "__main__":
+    main()
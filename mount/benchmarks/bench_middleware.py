@@ -0,0 +1,106 @@
+"""
+Per-request overhead of the middleware stack.
+
+Compares the pure ASGI stack against the same request id, metrics and
+logging work done through `@app.middleware("http")` (BaseHTTPMiddleware),
+as it was before. Requests go in-process through httpx's ASGI transport and
+stop before the database (health check, a token request failing
+validation, an unauthenticated listing) so only framework overhead is
+measured.
+
+    cd mount && LOG_LEVEL=CRITICAL LOG_FILE= python -m benchmarks.bench_middleware
+"""
+import asyncio
+import time
+from uuid import uuid4
+
+import httpx
+from fastapi import Request
+from sqlalchemy.ext.asyncio import create_async_engine
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core import logger, metrics
+from app.core.middlewares import RequestIDMiddleware, RequestLoggingMiddleware, RequestMetricsMiddleware
+from app.database.core import get_session_factory
+from app.main import app
+
+REQUESTS = 2000
+TARGETS = [
+    ("GET", "/", None),
+    ("POST", "/api/v1/auth/token", {}),
+    ("GET", "/api/v1/users", None),
+]
+
+
+async def request_id(request: Request, call_next):
+    request_id = request.headers.get("X-Request-ID") or uuid4().hex
+    request.state.request_id = request_id
+    response = await call_next(request)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+
+async def request_metrics(request: Request, call_next):
+    stats = metrics.start_request()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    metrics.observe_request(request.method, getattr(route, "path", "unmatched"), response.status_code, stats)
+    return response
+
+
+async def request_logging(request: Request, call_next):
+    started = time.perf_counter()
+    response = await call_next(request)
+    logger.hot_path(
+        "request",
+        request_id=request.state.request_id,
+        method=request.method,
+        path=request.url.path,
+        status=response.status_code,
+        latency_ms=round((time.perf_counter() - started) * 1000, 2),
+    )
+    return response
+
+
+def use_stack(middleware: list[Middleware]) -> None:
+    cors = [m for m in app.user_middleware if m.cls.__name__ == "CORSMiddleware"]
+    app.user_middleware = [*middleware, *cors]
+    app.middleware_stack = None
+
+
+async def measure(label: str) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for method, path, body in TARGETS:
+            await client.request(method, path, json=body)
+            started = time.perf_counter()
+            for _ in range(REQUESTS):
+                await client.request(method, path, json=body)
+            elapsed = time.perf_counter() - started
+            print(f"{label:<20} {method:<5} {path:<22} {REQUESTS / elapsed:>8,.0f} req/s")
+
+
+async def main() -> None:
+    # Sessions only connect on their first query, which these requests never reach
+    app.state.db_session_factory = get_session_factory(
+        create_async_engine("postgresql+asyncpg://bench@localhost/bench")
+    )
+
+    use_stack([
+        Middleware(BaseHTTPMiddleware, dispatch=request_id),
+        Middleware(BaseHTTPMiddleware, dispatch=request_metrics),
+        Middleware(BaseHTTPMiddleware, dispatch=request_logging),
+    ])
+    await measure("BaseHTTPMiddleware")
+
+    use_stack([
+        Middleware(RequestIDMiddleware),
+        Middleware(RequestMetricsMiddleware),
+        Middleware(RequestLoggingMiddleware),
+    ])
+    await measure("pure ASGI")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
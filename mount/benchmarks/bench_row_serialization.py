@@ -0,0 +1,69 @@
+"""
+Per-row cost of listing endpoints: ORM models validated through the
+response schema versus projected rows serialized straight to JSON.
+
+Runs against an in-memory SQLite database so only the Python side is
+measured.
+
+    cd mount && python -m benchmarks.bench_row_serialization
+"""
+import time
+from datetime import datetime
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.responses import RawJSONResponse
+from app.database.core import Base
+from app.database.models import User
+from app.repositories.base_repository import schema_fields
+from app.schemas.base_schema import BaseResponseModel
+from app.schemas.user_schema import UserPublic
+
+ROWS = 10_000
+ROUNDS = 5
+
+
+def measure(label: str, func) -> None:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:<24} {best / ROWS * 1_000_000:>8.2f} us/row")
+
+
+def main() -> None:
+    engine = create_engine("sqlite://")
+
+    @event.listens_for(engine, "connect")
+    def add_now_function(connection, _):
+        connection.create_function("NOW", 0, lambda: datetime.now().isoformat(" "))
+
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(User), [
+            {"full_name": f"User {i}", "email": f"user{i}@school.org", "password_hash": "x" * 60}
+            for i in range(ROWS)
+        ])
+
+    envelope = TypeAdapter(BaseResponseModel[list[UserPublic]])
+    columns = [getattr(User, field) for field in schema_fields(User, UserPublic)]
+
+    def models() -> None:
+        with Session(engine) as db:
+            users = db.scalars(select(User)).all()
+            envelope.dump_json(envelope.validate_python({"data": users}, from_attributes=True))
+
+    def rows() -> None:
+        with Session(engine) as db:
+            users = [dict(row) for row in db.execute(select(*columns)).mappings()]
+            RawJSONResponse({"meta": {}, "data": users})
+
+    measure("ORM + schema validation", models)
+    measure("projected rows", rows)
+
+
+if __name__ == "__main__":
+    main()
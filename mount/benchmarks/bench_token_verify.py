@@ -0,0 +1,42 @@
+"""
+Access token verification throughput.
+
+Compares the previous per-request `jose.jwt.decode` call against
+`TokenManager.decode` for each backend, cold (every token distinct) and
+warm (a client reusing its token).
+
+    cd mount && python -m benchmarks.bench_token_verify
+"""
+import time
+
+from jose import jwt
+
+from app.core.tokens import JWT_BACKENDS, TokenManager
+
+SECRET = "1a9a444f13a975cb125b74e24c3a9a741d9a45294c01c0462b6167c232f47915"
+ITERATIONS = 20_000
+
+
+def measure(label: str, func, tokens: list[str]) -> None:
+    started = time.perf_counter()
+    for token in tokens:
+        func(token)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<32} {len(tokens) / elapsed:>12,.0f} verifies/s")
+
+
+def main() -> None:
+    minted = TokenManager(secret_key=SECRET)
+    distinct = [minted.encode({"sub": str(i)}) for i in range(ITERATIONS)]
+    repeated = distinct[:1] * ITERATIONS
+
+    measure("jose.jwt.decode (baseline)", lambda token: jwt.decode(token, SECRET), distinct)
+
+    for backend in JWT_BACKENDS:
+        manager = TokenManager(secret_key=SECRET, backend=backend, cache_size=ITERATIONS)
+        measure(f"{backend} cold", manager.decode, distinct)
+        measure(f"{backend} cached", manager.decode, repeated)
+
+
+if __name__ == "__main__":
+    main()
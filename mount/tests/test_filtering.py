@@ -0,0 +1,62 @@
+from datetime import datetime
+
+import pytest
+
+from app.database.models import User
+from app.exceptions.query_exception import InvalidQueryException
+from app.repositories.filtering import split_conditions
+from app.schemas.filter_schema import FilterCondition, FilterOperator
+
+ALLOWED = frozenset({"id", "full_name", "email", "created_at"})
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("email:a@school.org", ("email", FilterOperator.EQ, "a@school.org")),
+    ("id:gte:10", ("id", FilterOperator.GTE, "10")),
+    ("id:in:1,2,3", ("id", FilterOperator.IN, ("1", "2", "3"))),
+    ("created_at:2024-01-01T10:00:00", ("created_at", FilterOperator.EQ, "2024-01-01T10:00:00")),
+    ("created_at:lt:2024-01-01T10:00:00", ("created_at", FilterOperator.LT, "2024-01-01T10:00:00")),
+    ("full_name:note:draft", ("full_name", FilterOperator.EQ, "note:draft")),
+])
+def test_parse(raw, expected):
+    condition = FilterCondition.parse(raw)
+    assert (condition.field, condition.op, condition.value) == expected
+
+
+def test_datetime_with_colons_is_coerced():
+    _, params = split_conditions(User, [FilterCondition.parse("created_at:2024-01-01T10:00:00")], ALLOWED)
+    assert params == {"p0": datetime(2024, 1, 1, 10, 0, 0)}
+
+
+def test_ilike_on_string_column():
+    _, params = split_conditions(User, [FilterCondition.parse("email:ilike:%@school.org")], ALLOWED)
+    assert params == {"p0": "%@school.org"}
+
+
+@pytest.mark.parametrize("raw", ["id:ilike:1", "created_at:ilike:2024%"])
+def test_ilike_on_other_columns_is_rejected(raw):
+    with pytest.raises(InvalidQueryException):
+        split_conditions(User, [FilterCondition.parse(raw)], ALLOWED)
+
+
+def test_field_not_allowed():
+    with pytest.raises(InvalidQueryException):
+        split_conditions(User, [FilterCondition.parse("password_hash:x")], ALLOWED)
+
+
+@pytest.mark.parametrize("raw", ["email", ":a@school.org", ":eq:a@school.org", ""])
+def test_parse_without_field_or_value_is_rejected(raw):
+    with pytest.raises(InvalidQueryException):
+        FilterCondition.parse(raw)
+
+
+@pytest.mark.parametrize("value, expected", [("true", True), ("1", True), ("No", False), ("0", False)])
+def test_boolean_values(value, expected):
+    shape, _ = split_conditions(User, [FilterCondition.parse(f"email:isnull:{value}")], ALLOWED)
+    assert shape == (("email", FilterOperator.ISNULL, expected),)
+
+
+@pytest.mark.parametrize("value", ["ture", "", "maybe"])
+def test_invalid_boolean_values_are_rejected(value):
+    with pytest.raises(InvalidQueryException):
+        split_conditions(User, [FilterCondition.parse(f"email:isnull:{value}")], ALLOWED)
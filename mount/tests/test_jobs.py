@@ -0,0 +1,83 @@
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import get_settings
+from app.core.exports import export_file
+from app.database.core import Base, get_session_factory
+from app.database.models.job import Job, JobStatus
+from app.exceptions.job_exception import InvalidJobPayloadException, UnknownJobException
+from app.jobs import JOB_HANDLERS, enqueue, schedule_periodic
+from app.jobs.worker import Worker
+from app.repositories.job_repository import job_repo
+from app.repositories.user_repository import user_repo
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def session_factory(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "export_dir", str(tmp_path / "exports"))
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}")
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def add_now(connection, record):
+        connection.create_function("NOW", 0, lambda: "2024-01-01 00:00:00")
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield get_session_factory(engine)
+    await engine.dispose()
+
+
+async def run_due_jobs(session_factory) -> None:
+    worker = Worker(session_factory)
+    async with session_factory() as db:
+        jobs = await job_repo.claim(db, limit=10)
+    for job in jobs:
+        await worker._execute(job)
+
+
+async def test_enqueue_validates_payload(session_factory):
+    async with session_factory() as db:
+        with pytest.raises(InvalidJobPayloadException):
+            await enqueue(db, "export_users", {"format": "xml"}, public_only=True)
+        with pytest.raises(UnknownJobException):
+            await enqueue(db, "purge_expired_exports", public_only=True)
+
+        job = await enqueue(db, "export_users", {"fields": "email"}, public_only=True)
+    assert job.payload == {"filter": [], "sort": None, "fields": "email", "format": "csv"}
+
+
+async def test_schedule_periodic_skips_pending_jobs(session_factory):
+    handler = JOB_HANDLERS["purge_expired_refresh_tokens"]
+    async with session_factory() as db:
+        assert await schedule_periodic(db, handler, delay_seconds=0) is not None
+        assert await schedule_periodic(db, handler, delay_seconds=0) is None
+
+
+async def test_periodic_job_queues_its_next_run(session_factory):
+    async with session_factory() as db:
+        await schedule_periodic(db, JOB_HANDLERS["purge_expired_exports"], delay_seconds=0)
+    await run_due_jobs(session_factory)
+
+    async with session_factory() as db:
+        jobs = (await db.scalars(select(Job).order_by(Job.id))).all()
+    assert [job.status for job in jobs] == [JobStatus.SUCCEEDED.value, JobStatus.QUEUED.value]
+    assert jobs[1].run_at > jobs[0].run_at
+
+
+async def test_export_job_writes_file(session_factory):
+    async with session_factory() as db:
+        await user_repo.create(db, obj_in={"full_name": "Ada", "email": "ada@school.org", "password_hash": "x"})
+        await enqueue(db, "export_users", {"format": "ndjson", "fields": "email"})
+        invalid = await enqueue(db, "export_users", {"fields": "password_hash"})
+    await run_due_jobs(session_factory)
+
+    async with session_factory() as db:
+        jobs = (await db.scalars(select(Job).order_by(Job.id))).all()
+    result = jobs[0].result
+    assert result["rows"] == 1
+    assert export_file(result["file"]).read_text() == '{"email":"ada@school.org"}\n'
+    # Invalid queries fail for good instead of being retried
+    assert (jobs[1].id, jobs[1].status, jobs[1].attempts) == (invalid.id, JobStatus.FAILED.value, 1)
@@ -0,0 +1,52 @@
+import base64
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import Boolean, Column, DateTime, Float, Integer, Numeric, String
+
+from app.exceptions.query_exception import InvalidCursorException
+from app.repositories.pagination import decode_cursor, encode_cursor
+
+
+def raw_cursor(*parts) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(parts)).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("column, value", [
+    (Column("id", Integer), 7),
+    (Column("full_name", String), "Ada"),
+    (Column("active", Boolean), True),
+    (Column("score", Float), 1.5),
+    (Column("created_at", DateTime), datetime(2024, 1, 1, 10, 0, 0)),
+    (Column("balance", Numeric), Decimal("10.25")),
+])
+def test_round_trip(column, value):
+    cursor = encode_cursor(column.name, value, 3)
+    assert decode_cursor(cursor, order_by=column.name, column=column) == (value, 3)
+
+
+def test_integer_value_for_float_column():
+    column = Column("score", Float)
+    assert decode_cursor(raw_cursor("score", 2, 3), order_by="score", column=column) == (2.0, 3)
+
+
+@pytest.mark.parametrize("cursor, column", [
+    ("not a cursor", Column("id", Integer)),
+    (raw_cursor("id", 1), Column("id", Integer)),
+    (raw_cursor("full_name", "Ada", 1), Column("id", Integer)),
+    (raw_cursor("id", "x", "y"), Column("id", Integer)),
+    (raw_cursor("id", 1, True), Column("id", Integer)),
+    (raw_cursor("id", "1", 1), Column("id", Integer)),
+    (raw_cursor("id", True, 1), Column("id", Integer)),
+    (raw_cursor("id", 1.5, 1), Column("id", Integer)),
+    (raw_cursor("full_name", 5, 1), Column("full_name", String)),
+    (raw_cursor("active", 1, 1), Column("active", Boolean)),
+    (raw_cursor("created_at", "yesterday", 1), Column("created_at", DateTime)),
+    (raw_cursor("balance", "ten", 1), Column("balance", Numeric)),
+    (raw_cursor("balance", [1], 1), Column("balance", Numeric)),
+])
+def test_invalid_cursor(cursor, column):
+    with pytest.raises(InvalidCursorException):
+        decode_cursor(cursor, order_by=column.name, column=column)
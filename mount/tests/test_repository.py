@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database.core import Base, get_session_factory
+from app.exceptions.query_exception import RecordConflictException
+from app.repositories.base_repository import GET_OR_CREATE_ATTEMPTS
+from app.repositories.user_repository import user_repo
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def db(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}")
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def add_now(connection, record):
+        connection.create_function("NOW", 0, lambda: "2024-01-01 00:00:00")
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with get_session_factory(engine)() as session:
+        yield session
+    await engine.dispose()
+
+
+USER = {"full_name": "Ada", "password_hash": "x"}
+
+
+async def test_get_or_create(db):
+    created, was_created = await user_repo.get_or_create(db, defaults=USER, email="ada@school.org")
+    found, found_created = await user_repo.get_or_create(db, defaults=USER, email="ada@school.org")
+    assert (was_created, found_created) == (True, False)
+    assert found.id == created.id
+
+
+async def test_get_or_create_needs_columns(db):
+    with pytest.raises(ValueError):
+        await user_repo.get_or_create(db, defaults=USER)
+
+
+async def test_create_unique_needs_columns(db):
+    with pytest.raises(ValueError):
+        await user_repo.create_unique(db, obj_in={**USER, "email": "ada@school.org"}, conflict_columns=[])
+
+
+async def test_get_or_create_gives_up_on_unmatched_conflicts(db, monkeypatch):
+    attempts = []
+
+    async def always_conflicts(db, *, obj_in, conflict_columns):
+        attempts.append(obj_in)
+        return None
+
+    monkeypatch.setattr(user_repo, "create_unique", always_conflicts)
+    with pytest.raises(RecordConflictException):
+        await user_repo.get_or_create(db, defaults=USER, email="ada@school.org")
+    assert len(attempts) == GET_OR_CREATE_ATTEMPTS
@@ -0,0 +1,21 @@
+import pytest
+
+from app.core.response_cache import etag_matches
+
+ETAG = '"5d41402abc4b2a76b9719d911017c592"'
+
+
+@pytest.mark.parametrize("if_none_match, expected", [
+    (ETAG, True),
+    (f"W/{ETAG}", True),
+    (f'"other", {ETAG}', True),
+    (f'"other",W/{ETAG} ', True),
+    ("*", True),
+    ("", False),
+    ('"other"', False),
+    (ETAG[:-5] + '"', False),
+    (f'"x{ETAG[1:]}', False),
+    (ETAG.strip('"'), False),
+])
+def test_etag_matches(if_none_match, expected):
+    assert etag_matches(ETAG, if_none_match) is expected
@@ -0,0 +1,163 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, delete, insert, select, update
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.cache import TTLCache
+from app.database import routing
+from app.database.core import get_session_factory
+from app.database.models import User
+from app.database.routing import set_consistency_key
+from app.repositories.base_repository import identity_cache
+from app.repositories.user_repository import user_repo
+
+pytestmark = pytest.mark.anyio
+
+# Every database holds one row naming it, so a read shows where it went
+marker = Table(
+    "marker",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("source", String),
+)
+REPLICAS = {"replica1", "replica2"}
+
+
+@pytest.fixture
+async def databases(tmp_path):
+    engines = {}
+    for name in ("primary", *sorted(REPLICAS)):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}.db")
+        async with engine.begin() as connection:
+            await connection.run_sync(marker.create)
+            await connection.execute(insert(marker).values(id=1, source=name))
+        engines[name] = engine
+    yield engines
+    for engine in engines.values():
+        await engine.dispose()
+
+
+@pytest.fixture
+def session_factory(databases):
+    return get_session_factory(
+        databases["primary"], [databases[name] for name in sorted(REPLICAS)]
+    )
+
+
+@pytest.fixture(autouse=True)
+def consistency(monkeypatch):
+    monkeypatch.setattr(routing, "recent_writers", TTLCache(maxsize=100, ttl=0.2))
+    set_consistency_key(None)
+    yield
+    set_consistency_key(None)
+
+
+async def read_source(db, stmt=None) -> str:
+    return (await db.execute(stmt if stmt is not None else select(marker.c.source))).scalar_one()
+
+
+async def sources(engine) -> list[str]:
+    async with engine.connect() as connection:
+        return list((await connection.execute(select(marker.c.source).order_by(marker.c.id))).scalars())
+
+
+async def test_selects_go_to_replicas(session_factory):
+    seen = set()
+    for _ in range(50):
+        async with session_factory() as db:
+            seen.add(await read_source(db))
+    assert seen == REPLICAS
+
+
+async def test_without_replicas_everything_goes_to_primary(databases):
+    session_factory = get_session_factory(databases["primary"])
+    async with session_factory() as db:
+        assert await read_source(db) == "primary"
+
+
+async def test_select_for_update_goes_to_primary(session_factory):
+    async with session_factory() as db:
+        assert await read_source(db, select(marker.c.source).with_for_update()) == "primary"
+
+
+@pytest.mark.parametrize("stmt", [
+    insert(marker).values(id=2, source="written"),
+    update(marker).where(marker.c.id == 1).values(source="written"),
+    delete(marker).where(marker.c.id == 1),
+])
+async def test_writes_go_to_primary(databases, session_factory, stmt):
+    async with session_factory() as db:
+        await db.execute(stmt)
+        await db.commit()
+
+    assert await sources(databases["primary"]) != ["primary"]
+    for name in REPLICAS:
+        assert await sources(databases[name]) == [name]
+
+
+async def test_reads_stick_to_primary_once_session_wrote(session_factory):
+    async with session_factory() as db:
+        assert await read_source(db) in REPLICAS
+        await db.execute(insert(marker).values(id=2, source="written"))
+        await db.commit()
+
+        for _ in range(10):
+            assert await read_source(db, select(marker.c.source).where(marker.c.id == 1)) == "primary"
+
+
+async def test_use_primary_bind_argument(session_factory):
+    async with session_factory() as db:
+        result = await db.execute(select(marker.c.source), bind_arguments={"use_primary": True})
+        assert result.scalar_one() == "primary"
+        assert await read_source(db) in REPLICAS
+
+
+async def test_identity_cache_loads_from_primary(databases, session_factory):
+    for name, engine in databases.items():
+        async with engine.begin() as connection:
+            await connection.run_sync(User.__table__.create)
+            await connection.execute(insert(User).values(
+                id=1,
+                full_name=name,
+                email="a@school.org",
+                password_hash="x",
+                created_at=datetime(2024, 1, 1),
+                updated_at=datetime(2024, 1, 1),
+            ))
+    identity_cache.clear()
+
+    try:
+        for _ in range(3):
+            async with session_factory() as db:
+                assert (await user_repo.get(db, 1)).full_name == "primary"
+        assert identity_cache.get((User, 1))["full_name"] == "primary"
+    finally:
+        identity_cache.clear()
+
+
+async def test_direct_connection_counts_as_write(session_factory):
+    async with session_factory() as db:
+        await db.connection()
+        assert await read_source(db) == "primary"
+
+
+async def test_recent_writer_reads_from_primary_until_window_ends(session_factory):
+    set_consistency_key("user:1")
+    async with session_factory() as db:
+        await db.execute(insert(marker).values(id=2, source="written"))
+        await db.commit()
+
+    for _ in range(10):
+        async with session_factory() as db:
+            assert await read_source(db, select(marker.c.source).where(marker.c.id == 1)) == "primary"
+
+    set_consistency_key("user:2")
+    async with session_factory() as db:
+        assert await read_source(db) in REPLICAS
+
+    await asyncio.sleep(0.25)
+    set_consistency_key("user:1")
+    async with session_factory() as db:
+        assert await read_source(db) in REPLICAS
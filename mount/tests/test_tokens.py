@@ -0,0 +1,64 @@
+import base64
+import time
+
+import orjson
+import pytest
+
+from app.core.tokens import JWT_BACKENDS, ExpiredTokenError, HMACBackend, TokenError, TokenManager
+
+SECRET = "1a9a444f13a975cb125b74e24c3a9a741d9a45294c01c0462b6167c232f47915"
+KEY = SECRET.encode()
+
+
+@pytest.mark.parametrize("minted_by", sorted(JWT_BACKENDS))
+@pytest.mark.parametrize("verified_by", sorted(JWT_BACKENDS))
+def test_backends_accept_each_others_tokens(minted_by, verified_by):
+    token = TokenManager(secret_key=SECRET, backend=minted_by).encode({"sub": "1", "name": "Ada"})
+    claims = TokenManager(secret_key=SECRET, backend=verified_by).decode(token)
+    assert claims["sub"] == "1"
+    assert claims["name"] == "Ada"
+    assert claims["exp"] > time.time()
+
+
+def test_hmac_rejects_expired_token():
+    token = HMACBackend().encode({"sub": "1", "exp": int(time.time()) - 10}, KEY, "HS256")
+    with pytest.raises(ExpiredTokenError):
+        HMACBackend().decode(token, KEY, ["HS256"])
+
+
+def test_hmac_rejects_token_not_yet_valid():
+    token = HMACBackend().encode({"sub": "1", "nbf": int(time.time()) + 60}, KEY, "HS256")
+    with pytest.raises(TokenError):
+        HMACBackend().decode(token, KEY, ["HS256"])
+
+
+def test_hmac_rejects_other_key():
+    token = HMACBackend().encode({"sub": "1"}, b"other", "HS256")
+    with pytest.raises(TokenError):
+        HMACBackend().decode(token, KEY, ["HS256"])
+
+
+def test_hmac_rejects_tampered_payload():
+    header, payload, signature = HMACBackend().encode({"sub": "1"}, KEY, "HS256").split(".")
+    forged = HMACBackend().encode({"sub": "2"}, KEY, "HS256").split(".")[1]
+    with pytest.raises(TokenError):
+        HMACBackend().decode(f"{header}.{forged}.{signature}", KEY, ["HS256"])
+
+
+@pytest.mark.parametrize("algorithm", ["HS512", "none"])
+def test_hmac_rejects_algorithm_not_allowed(algorithm):
+    _, payload, signature = HMACBackend().encode({"sub": "1"}, KEY, "HS512").split(".")
+    header = base64.urlsafe_b64encode(orjson.dumps({"alg": algorithm})).rstrip(b"=").decode()
+    with pytest.raises(TokenError):
+        HMACBackend().decode(f"{header}.{payload}.{signature}", KEY, ["HS256"])
+
+
+@pytest.mark.parametrize("token", ["", "abc", "a.b", "a.b.c", "a.b.c.d", "é.é.é"])
+def test_hmac_rejects_malformed_token(token):
+    with pytest.raises(TokenError):
+        HMACBackend().decode(token, KEY, ["HS256"])
+
+
+def test_hmac_backend_requires_hmac_algorithm():
+    with pytest.raises(ValueError):
+        TokenManager(secret_key=SECRET, algorithm="RS256", backend="hmac")
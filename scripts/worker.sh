@@ -0,0 +1,16 @@
+#!/bin/bash
+
+# Check if MOUNT_PATH environment variable exists
+if [ -z "$MOUNT_PATH" ]; then
+    echo "Error: MOUNT_PATH environment variable is missing."
+    echo "MOUNT_PATH must be set before running this script."
+    exit 1
+fi
+
+# sleep for 10 seconds so the API container can run the migrations first
+sleep 10s
+
+cd $MOUNT_PATH
+
+echo "Running background job worker..."
+exec python -m app.jobs.worker